@@ -0,0 +1,40 @@
+"""add active booking partial indexes
+
+Revision ID: 3b8e5d2f9c61
+Revises: b7a1c2d3e4f5
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8e5d2f9c61"
+down_revision: Union[str, Sequence[str], None] = "b7a1c2d3e4f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_bookings_room_active_dates",
+        "bookings",
+        ["room_id", "start_date", "end_date"],
+        unique=False,
+        postgresql_where=sa.text("status in ('pending', 'confirmed')"),
+    )
+    op.create_index(
+        "ix_bookings_cabin_active_dates",
+        "bookings",
+        ["cabin_id", "start_date", "end_date"],
+        unique=False,
+        postgresql_where=sa.text("status in ('pending', 'confirmed')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_cabin_active_dates", table_name="bookings")
+    op.drop_index("ix_bookings_room_active_dates", table_name="bookings")
@@ -0,0 +1,43 @@
+"""add media variants
+
+Revision ID: 4b8e2d6f1a93
+Revises: 9a4f7c1e3d28
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4b8e2d6f1a93"
+down_revision: Union[str, Sequence[str], None] = "9a4f7c1e3d28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_variants",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("source_key", sa.String(length=512), nullable=False),
+        sa.Column("file_key", sa.String(length=512), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=False),
+        sa.Column("height", sa.Integer(), nullable=False),
+        sa.Column("byte_size", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("file_key"),
+        sa.UniqueConstraint("source_key", "width", name="uq_media_variants_source_width"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("media_variants")
@@ -0,0 +1,37 @@
+"""add keyset pagination indexes
+
+Revision ID: 6d1c4a7e2b90
+Revises: 3b8e5d2f9c61
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6d1c4a7e2b90"
+down_revision: Union[str, Sequence[str], None] = "3b8e5d2f9c61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_bookings_created_id",
+        "bookings",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_users_created_id",
+        "users",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_id", table_name="users")
+    op.drop_index("ix_bookings_created_id", table_name="bookings")
@@ -0,0 +1,34 @@
+"""add guest booking email index
+
+Revision ID: 7c3f9a2e5b14
+Revises: 4b8e2d6f1a93
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3f9a2e5b14"
+down_revision: Union[str, Sequence[str], None] = "4b8e2d6f1a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the guest-booking branch of /checkout/my; rows with a user_id
+    # are found through ix_bookings_user_created instead.
+    op.create_index(
+        "ix_bookings_guest_email_created",
+        "bookings",
+        ["email", "created_at"],
+        unique=False,
+        postgresql_where=sa.text("user_id is null"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_guest_email_created", table_name="bookings")
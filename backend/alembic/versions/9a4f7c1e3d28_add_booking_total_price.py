@@ -0,0 +1,26 @@
+"""add booking total price
+
+Revision ID: 9a4f7c1e3d28
+Revises: 6d1c4a7e2b90
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4f7c1e3d28"
+down_revision: Union[str, Sequence[str], None] = "6d1c4a7e2b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("bookings", sa.Column("total_price", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("bookings", "total_price")
@@ -6,7 +6,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
-from app.auth.hash import verify_access_token
+from app.auth.hash import decode_access_token, verify_access_token
+from app.auth.jwt_handler import TokenClaims
+from app.auth.user_cache import UserPrincipal, user_cache
 from app.database import get_db
 
 
@@ -14,13 +16,27 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 
+async def _load_principal(email: str, db: AsyncSession) -> UserPrincipal | None:
+    principal = user_cache.get(email)
+    if principal is not None:
+        return principal
+
+    generation = user_cache.generation
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    user = result.scalar_one_or_none()
+    if user is None:
+        return None
+    principal = UserPrincipal.from_user(user)
+    user_cache.put(email, principal, generation)
+    return principal
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
 ):
     email = verify_access_token(token)
-    result = await db.execute(select(models.User).where(models.User.email == email))
-    user = result.scalar_one_or_none()
+    user = await _load_principal(email, db)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -34,11 +50,22 @@ async def get_current_user_optional(
         return None
 
     email = verify_access_token(token)
-    result = await db.execute(select(models.User).where(models.User.email == email))
-    return result.scalar_one_or_none()
+    return await _load_principal(email, db)
 
 
-async def get_current_admin(current_user: models.User = Depends(get_current_user)):
+async def get_current_admin(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> TokenClaims | UserPrincipal:
+    # The role claim spares admin routes the users lookup, unless the user
+    # changed (demoted, deleted) within a token lifetime or this worker may
+    # have missed such a change. Tokens without claims take the old path.
+    claims = decode_access_token(token)
+    current_user: TokenClaims | UserPrincipal = claims
+    if claims.role is None or not user_cache.claims_trusted(claims.user_id):
+        current_user = await _load_principal(claims.email, db)
+        if not current_user:
+            raise HTTPException(status_code=404, detail="User not found")
     if str(current_user.role) not in {"admin", "UserRole.admin"}:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
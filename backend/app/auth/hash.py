@@ -1,18 +1,52 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.auth.jwt_handler import TokenClaims
 from app.core.config import settings
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small thread pool hashes in parallel without
+# blocking the event loop. Work beyond the pool size plus the queue allowance
+# is rejected up front instead of piling up behind slow hashes.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_max_pending_hashes = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+_pending_hashes = 0
 
-def hash_password(password: str):
-    return pwd_context.hash(password)
 
+async def _run_password_job(func, *args):
+    global _pending_hashes
+    if _pending_hashes >= _max_pending_hashes:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is temporarily overloaded, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _pending_hashes += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        _pending_hashes -= 1
 
-def verify_access_token(token: str):
+
+async def hash_password(password: str) -> str:
+    return await _run_password_job(pwd_context.hash, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await _run_password_job(pwd_context.verify, password, hashed_password)
+
+
+def decode_access_token(token: str) -> TokenClaims:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALG])
         email: str = payload.get("sub")
@@ -22,10 +56,14 @@ def verify_access_token(token: str):
                 detail="Could not validate token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return email
+        return TokenClaims(email=email, user_id=payload.get("uid"), role=payload.get("role"))
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+def verify_access_token(token: str):
+    return decode_access_token(token).email
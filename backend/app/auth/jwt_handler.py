@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 from jose import jwt
@@ -5,6 +6,19 @@ from jose import jwt
 from app.core.config import settings
 
 
+@dataclass(frozen=True, slots=True)
+class TokenClaims:
+    """Identity carried by an access token.
+
+    ``user_id`` and ``role`` are None for tokens issued before they were
+    added as claims; those are resolved through the user lookup instead.
+    """
+
+    email: str
+    user_id: int | None = None
+    role: str | None = None
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -12,3 +26,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     )
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALG)
+
+
+def create_user_access_token(user) -> str:
+    role = getattr(user.role, "value", user.role)
+    return create_access_token({"sub": user.email, "uid": user.id, "role": role})
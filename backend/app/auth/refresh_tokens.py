@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 5000
+
+
+def _hash_token(raw_token: str) -> str:
+    # 256 random bits need no salt or slow hash; SHA-256 keeps lookups indexed.
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def issue_refresh_token(
+    db: AsyncSession, user_id: int, family_id: str | None = None
+) -> str:
+    """Store a new refresh token and return its raw value. The caller commits."""
+    raw_token = secrets.token_urlsafe(32)
+    db.add(
+        models.RefreshToken(
+            user_id=user_id,
+            family_id=family_id or uuid4().hex,
+            token_hash=_hash_token(raw_token),
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return raw_token
+
+
+async def _revoke_family(db: AsyncSession, family_id: str) -> None:
+    await db.execute(
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.family_id == family_id,
+            models.RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+
+
+async def rotate_refresh_token(db: AsyncSession, raw_token: str) -> tuple[models.User, str]:
+    """Spend ``raw_token`` and issue its successor in the same family.
+
+    A token that was already spent has been replayed: the family is revoked
+    (and committed) so neither the thief nor the client can keep refreshing.
+    The caller commits on success.
+    """
+    result = await db.execute(
+        select(models.RefreshToken, models.User)
+        .join(models.User, models.User.id == models.RefreshToken.user_id)
+        .where(models.RefreshToken.token_hash == _hash_token(raw_token))
+        .with_for_update(of=models.RefreshToken)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise _invalid_refresh_token()
+    token, user = row
+
+    if token.revoked_at is not None:
+        raise _invalid_refresh_token()
+    if token.used_at is not None:
+        logger.warning(
+            "Refresh token reuse for user %s, revoking family %s", user.id, token.family_id
+        )
+        await _revoke_family(db, token.family_id)
+        await db.commit()
+        raise _invalid_refresh_token()
+    if token.expires_at <= datetime.now(timezone.utc):
+        raise _invalid_refresh_token()
+
+    token.used_at = datetime.now(timezone.utc)
+    return user, await issue_refresh_token(db, user.id, token.family_id)
+
+
+async def revoke_refresh_token(db: AsyncSession, raw_token: str) -> None:
+    """Log out the session ``raw_token`` belongs to. The caller commits."""
+    family_id = await db.scalar(
+        select(models.RefreshToken.family_id).where(
+            models.RefreshToken.token_hash == _hash_token(raw_token)
+        )
+    )
+    if family_id is not None:
+        await _revoke_family(db, family_id)
+
+
+async def revoke_user_refresh_tokens(db: AsyncSession, user_id: int) -> None:
+    """End every session of a user, e.g. after a password or role change."""
+    await db.execute(
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.user_id == user_id,
+            models.RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+
+
+async def purge_refresh_tokens(db: AsyncSession) -> int:
+    """Delete expired and revoked tokens; returns how many rows went.
+
+    Used tokens are kept until they expire: they are what detects a replay.
+    Deletes in committed batches so refreshes are never blocked for long.
+    """
+    purged = 0
+    while True:
+        batch = (
+            select(models.RefreshToken.id)
+            .where(
+                or_(
+                    models.RefreshToken.expires_at <= datetime.now(timezone.utc),
+                    models.RefreshToken.revoked_at.is_not(None),
+                )
+            )
+            .limit(PURGE_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(models.RefreshToken).where(models.RefreshToken.id.in_(batch))
+        )
+        await db.commit()
+        purged += result.rowcount
+        if result.rowcount < PURGE_BATCH_SIZE:
+            return purged
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database import InvalidationBus
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True, slots=True)
+class UserPrincipal:
+    """Immutable snapshot of the authenticated user, safe to share between requests."""
+
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    role: UserRole
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            role=user.role,
+            created_at=user.created_at,
+        )
+
+
+class UserCache:
+    """LRU cache of user principals keyed by JWT subject, bounded by size and TTL.
+
+    ``generation`` is bumped on every invalidation so a principal read from
+    the database while a user change was committed is not stored.
+
+    It also remembers which users changed within the last access-token
+    lifetime (``claim_trust_seconds``): tokens issued to them may carry a
+    stale role claim. After a start or resync, when changes may have been
+    missed, that holds for every user.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int, claim_trust_seconds: float) -> None:
+        self._entries: TTLCache[str, UserPrincipal] = TTLCache(
+            ttl_seconds, max_size, on_remove=self._forget_subject
+        )
+        self._subjects_by_id: dict[int, str] = {}
+        self.generation = 0
+        self.claim_trust_seconds = claim_trust_seconds
+        self._changed_at: dict[int, float] = {}
+        self._all_changed_at = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self._entries.enabled
+
+    def get(self, subject: str) -> UserPrincipal | None:
+        return self._entries.get(subject)
+
+    def put(self, subject: str, principal: UserPrincipal, generation: int) -> None:
+        if not self.enabled or generation != self.generation:
+            return
+        self._entries.put(subject, principal)
+        self._subjects_by_id[principal.id] = subject
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.generation += 1
+        now = time.monotonic()
+        horizon = now - self.claim_trust_seconds
+        for stale_id in [uid for uid, at in self._changed_at.items() if at <= horizon]:
+            del self._changed_at[stale_id]
+        self._changed_at[user_id] = now
+        subject = self._subjects_by_id.get(user_id)
+        if subject is not None:
+            self._entries.pop(subject)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._subjects_by_id.clear()
+        self._changed_at.clear()
+        self._all_changed_at = time.monotonic()
+
+    def claims_trusted(self, user_id: int) -> bool:
+        """Whether the role claim of a token issued to ``user_id`` is still current."""
+        horizon = time.monotonic() - self.claim_trust_seconds
+        if self._all_changed_at > horizon:
+            return False
+        changed_at = self._changed_at.get(user_id)
+        return changed_at is None or changed_at <= horizon
+
+    def stats(self) -> dict[str, float]:
+        return self._entries.stats()
+
+    def _forget_subject(self, subject: str, principal: UserPrincipal) -> None:
+        if self._subjects_by_id.get(principal.id) == subject:
+            del self._subjects_by_id[principal.id]
+
+
+def register_invalidation_handlers(bus: InvalidationBus) -> None:
+    bus.subscribe("user", lambda data: user_cache.invalidate_user(data["id"]))
+    bus.on_resync(user_cache.clear)
+
+
+user_cache = UserCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    claim_trust_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    max_size=settings.USER_CACHE_MAX_SIZE,
+)
@@ -0,0 +1,126 @@
+"""Admin command line tools.
+
+Usage:
+    python -m app.cli import-bookings bookings.csv [--format ndjson] [--dry-run] [--atomic]
+    python -m app.cli export-bookings [--format ndjson] [--output bookings.csv]
+    python -m app.cli media-gc [--grace-hours 24] [--prefix rooms/] [--execute]
+    python -m app.cli purge-refresh-tokens
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import asyncpg
+
+from app.auth.refresh_tokens import purge_refresh_tokens
+from app.core.config import settings
+from app.database import AsyncSessionLocal, engine, invalidation_bus
+from app.services import booking_io, media_gc
+
+
+def _guess_format(path: str) -> booking_io.BookingFormat:
+    return "ndjson" if Path(path).suffix.lower() in {".ndjson", ".jsonl"} else "csv"
+
+
+async def import_bookings(args: argparse.Namespace) -> int:
+    fmt = args.format or _guess_format(args.path)
+    data = Path(args.path).read_text(encoding="utf-8-sig")
+    rows = booking_io.parse_bookings(data, fmt)
+
+    async with AsyncSessionLocal() as session:
+        try:
+            report = await booking_io.import_bookings(
+                session, rows, dry_run=args.dry_run, atomic=args.atomic
+            )
+            if report.imported:
+                await invalidation_bus.publish(
+                    session, "booking_import", imported=report.imported
+                )
+                await session.commit()
+        except asyncpg.exceptions.IntegrityConstraintViolationError as exc:
+            await session.rollback()
+            print(f"Bookings changed during import, retry the batch: {exc}", file=sys.stderr)
+            return 2
+
+    print(report.model_dump_json(indent=2))
+    return 1 if report.errors else 0
+
+
+async def export_bookings(args: argparse.Namespace) -> int:
+    fmt = args.format or (_guess_format(args.output) if args.output else "csv")
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async for chunk in booking_io.export_bookings(fmt):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+async def collect_media_garbage(args: argparse.Namespace) -> int:
+    async with AsyncSessionLocal() as session:
+        report = await media_gc.collect_garbage(
+            session,
+            dry_run=not args.execute,
+            grace_hours=args.grace_hours,
+            prefix=args.prefix,
+        )
+        await session.commit()
+
+    print(report.model_dump_json(indent=2))
+    return 1 if report.errors else 0
+
+
+async def purge_expired_refresh_tokens(_args: argparse.Namespace) -> int:
+    async with AsyncSessionLocal() as session:
+        purged = await purge_refresh_tokens(session)
+
+    print(f"Purged {purged} refresh tokens")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import-bookings", help="Bulk import bookings")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=["csv", "ndjson"])
+    import_parser.add_argument("--dry-run", action="store_true")
+    import_parser.add_argument("--atomic", action="store_true")
+    import_parser.set_defaults(handler=import_bookings)
+
+    export_parser = commands.add_parser("export-bookings", help="Stream bookings out")
+    export_parser.add_argument("--format", choices=["csv", "ndjson"])
+    export_parser.add_argument("--output")
+    export_parser.set_defaults(handler=export_bookings)
+
+    gc_parser = commands.add_parser(
+        "media-gc", help="Report (or with --execute, delete) unreferenced media"
+    )
+    gc_parser.add_argument("--grace-hours", type=float, default=settings.MEDIA_GC_GRACE_HOURS)
+    gc_parser.add_argument("--prefix", default="")
+    gc_parser.add_argument("--execute", action="store_true", help="delete instead of a dry run")
+    gc_parser.set_defaults(handler=collect_media_garbage)
+
+    purge_parser = commands.add_parser(
+        "purge-refresh-tokens", help="Delete expired and revoked refresh tokens"
+    )
+    purge_parser.set_defaults(handler=purge_expired_refresh_tokens)
+
+    args = parser.parse_args()
+
+    async def run() -> int:
+        try:
+            return await args.handler(args)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
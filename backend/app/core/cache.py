@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Process-local LRU cache bounded by size, whose entries expire after a TTL.
+
+    ``on_remove`` is called with each entry that leaves the cache other than
+    through :meth:`clear`: on expiry, eviction, replacement or :meth:`pop`.
+    A ``max_size`` or ``ttl_seconds`` of 0 disables it.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_size: int,
+        on_remove: Callable[[K, V], None] | None = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._on_remove = on_remove
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> list[K]:
+        return list(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        if not self.enabled:
+            return
+        self.pop(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        while len(self._entries) > self.max_size:
+            oldest, (_expires_at, evicted) = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self._on_remove is not None:
+                self._on_remove(oldest, evicted)
+
+    def pop(self, key: K) -> V | None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        if self._on_remove is not None:
+            self._on_remove(key, entry[1])
+        return entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
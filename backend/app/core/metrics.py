@@ -0,0 +1,151 @@
+import logging
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.database import QueryStats, query_stats
+
+
+logger = logging.getLogger(__name__)
+
+
+# Fixed buckets keep observe() constant time and series comparable across deploys.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status class.",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and method.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+
+def _route_path(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+
+def _multiprocess_dir() -> str | None:
+    return os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Prometheus text exposition of this worker, or of all workers when
+    ``PROMETHEUS_MULTIPROC_DIR`` points at the shared collector directory."""
+    if _multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    if _multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Record count, latency and in-flight requests per route template.
+
+    The route is read from ``scope["route"]`` after routing, so
+    ``/checkout/admin/12/status`` is reported as
+    ``/checkout/admin/{booking_id}/status`` and label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        in_flight = IN_FLIGHT.labels(method)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            route_path = _route_path(scope)
+            REQUESTS.labels(method, route_path, f"{status_code // 100}xx").inc()
+            REQUEST_LATENCY.labels(method, route_path).observe(elapsed)
+
+
+class QueryStatsMiddleware:
+    """Count SQL statements and database time per request.
+
+    The totals go out as a ``Server-Timing: db;dur=...`` header (statements
+    run after the headers were sent, e.g. in a streamed body, are not
+    included) and requests above ``QUERY_COUNT_WARN_THRESHOLD`` statements
+    are logged.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.reset(token)
+            if stats.count > settings.QUERY_COUNT_WARN_THRESHOLD:
+                logger.warning(
+                    "%s %s ran %d queries (%.1fms)",
+                    scope["method"],
+                    _route_path(scope),
+                    stats.count,
+                    stats.duration * 1000,
+                )
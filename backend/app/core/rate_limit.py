@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.auth.hash import decode_access_token
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+
+# "<requests>/<period>[:<burst>]" per client kind; burst defaults to requests.
+# Keys are concrete paths: the limiter runs before routing.
+DEFAULT_RATE_LIMITS: dict[str, dict[str, str]] = {
+    "POST /auth/login": {"ip": "10/minute:5"},
+    "POST /auth/register": {"ip": "5/minute"},
+    "POST /auth/refresh": {"ip": "60/minute:20"},
+    "POST /search": {"ip": "60/minute:20", "user": "120/minute:30"},
+    "POST /room_admin/public/search": {"ip": "60/minute:20", "user": "120/minute:30"},
+    "POST /room_admin/public/c": {"ip": "60/minute:20", "user": "120/minute:30"},
+    "POST /cabin_admin/public/search": {"ip": "60/minute:20", "user": "120/minute:30"},
+    "POST /checkout/": {"ip": "20/minute:5", "user": "10/minute:5"},
+}
+# Monitoring must keep working while the server sheds load.
+ADMISSION_EXEMPT_PATHS = ("/metrics",)
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    per_second: float
+    burst: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        rate, _, burst = spec.partition(":")
+        count, _, period = rate.partition("/")
+        requests = int(count)
+        return cls(per_second=requests / PERIODS[period.strip()], burst=int(burst or requests))
+
+
+def load_rules(overrides: str | None) -> dict[str, dict[str, RateLimit]]:
+    """Default per-route limits merged with the ``RATE_LIMIT_RULES`` JSON.
+
+    An override replaces the whole entry of its route; ``{}`` removes it.
+    """
+    raw = dict(DEFAULT_RATE_LIMITS)
+    if overrides:
+        raw.update(json.loads(overrides))
+    return {
+        route: {kind: RateLimit.parse(spec) for kind, spec in limits.items()}
+        for route, limits in raw.items()
+        if limits
+    }
+
+
+class MemoryBucketStore:
+    """Token buckets in this worker's memory; the least recently used are dropped."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Spend one token; 0 when allowed, otherwise seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - updated_at) * limit.per_second)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / limit.per_second
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+# Atomic refill-and-take, timed by the Redis clock so workers agree.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisBucketStore:
+    """Token buckets shared by all workers; needs the optional ``redis`` package."""
+
+    def __init__(self, url: str) -> None:
+        from redis import asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        result = await self._take(keys=[f"ratelimit:{key}"], args=[limit.per_second, limit.burst])
+        return float(result)
+
+
+class AdmissionController:
+    """Caps requests in flight so overload waits here, briefly, not in the DB pool.
+
+    Up to ``queue_size`` requests wait at most ``timeout`` seconds for a slot;
+    the rest are rejected at once. A ``limit`` of 0 disables it.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float) -> None:
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(max(limit, 1))
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 0
+
+    async def acquire(self) -> bool:
+        if self._slots.locked():
+            if self.waiting >= self.queue_size:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "queue_size": self.queue_size,
+            "rejected": self.rejected,
+        }
+
+
+class RateLimitMiddleware:
+    """Per-route token buckets per client IP and per user, then admission control.
+
+    The user is taken from the bearer token's claims without a database
+    lookup; invalid tokens are only limited per IP (the route rejects them).
+    A store failure lets the request through rather than failing it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.rules = load_rules(settings.RATE_LIMIT_RULES)
+        self.store = (
+            RedisBucketStore(settings.RATE_LIMIT_REDIS_URL)
+            if settings.RATE_LIMIT_REDIS_URL
+            else MemoryBucketStore()
+        )
+
+    def _client_ip(self, scope: Scope, headers: Headers) -> str:
+        if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def _user_key(headers: Headers) -> str | None:
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        try:
+            claims = decode_access_token(token)
+        except HTTPException:
+            return None
+        return str(claims.user_id if claims.user_id is not None else claims.email)
+
+    async def _retry_after(self, scope: Scope, route: str, limits: dict[str, RateLimit]) -> float:
+        headers = Headers(scope=scope)
+        clients = {"ip": self._client_ip(scope, headers)}
+        if "user" in limits:
+            user_key = self._user_key(headers)
+            if user_key is not None:
+                clients["user"] = user_key
+        retry_after = 0.0
+        for kind, client in clients.items():
+            limit = limits.get(kind)
+            if limit is None:
+                continue
+            try:
+                wait = await self.store.take(f"{route}|{kind}:{client}", limit)
+            except Exception:
+                logger.exception("Rate limit store failed; admitting request")
+                return 0.0
+            retry_after = max(retry_after, wait)
+        return retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        route = f"{scope['method']} {path}"
+        limits = self.rules.get(route) or self.rules.get(f"{route.rstrip('/')}/")
+        if limits:
+            retry_after = await self._retry_after(scope, route, limits)
+            if retry_after > 0:
+                response = JSONResponse(
+                    {"detail": "Too many requests, please retry later"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+                await response(scope, receive, send)
+                return
+
+        if not admission.enabled or path.startswith(ADMISSION_EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+        if not await admission.acquire():
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.release()
+
+
+admission = AdmissionController(
+    limit=settings.MAX_CONCURRENT_REQUESTS,
+    queue_size=settings.ADMISSION_QUEUE_SIZE,
+    timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
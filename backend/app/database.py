@@ -1,8 +1,205 @@
+import asyncio
+import inspect
+import json
+import logging
+import random
+import re
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+import asyncpg
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DB_ECHO, future=True)
+logger = logging.getLogger(__name__)
+
+
+class _LatencyStats:
+    SAMPLE_SIZE = 1024
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: deque[float] = deque(maxlen=self.SAMPLE_SIZE)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def snapshot(self) -> dict[str, float | int]:
+        recent = sorted(self._recent)
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p95_ms": round(p95 * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class PoolMetrics:
+    """Connection pool counters of this worker, fed by pool events.
+
+    ``wait`` is the time a caller spends getting a connection out of the pool
+    (including opening an overflow connection and the pre-ping), ``connect``
+    the time to open a new DBAPI connection. A growing wait p95 or any
+    timeouts mean the pool is too small for the worker's concurrency.
+    """
+
+    def __init__(self) -> None:
+        self.wait = _LatencyStats()
+        self.connect = _LatencyStats()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+
+    def install(self, sync_engine: Engine) -> None:
+        event.listen(sync_engine, "do_connect", self._on_do_connect)
+        event.listen(sync_engine.pool, "connect", self._on_connect)
+        event.listen(sync_engine.pool, "checkout", self._on_checkout)
+        event.listen(sync_engine.pool, "invalidate", self._on_invalidate)
+
+    def _on_do_connect(self, _dialect, connection_record, _cargs, _cparams) -> None:
+        connection_record.info["connect_started"] = time.perf_counter()
+
+    def _on_connect(self, _dbapi_connection, connection_record) -> None:
+        started = connection_record.info.pop("connect_started", None)
+        if started is not None:
+            self.connect.record(time.perf_counter() - started)
+
+    def _on_checkout(self, _dbapi_connection, _connection_record, _connection_proxy) -> None:
+        self.checkouts += 1
+
+    def _on_invalidate(self, _dbapi_connection, _connection_record, _exception) -> None:
+        self.invalidations += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        return {
+            "size": pool.size(),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "invalidations": self.invalidations,
+            "wait": self.wait.snapshot(),
+            "connect": self.connect.snapshot(),
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that times how long callers wait for a connection.
+
+    Pool events fire only after a connection was handed out, so the wait
+    itself is measured around :meth:`connect`.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            pool_metrics.wait.record(time.perf_counter() - started)
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    future=True,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    # asyncpg's own cache and SQLAlchemy's prepared statement cache on top of it;
+    # set to 0 behind a transaction-mode PgBouncer.
+    connect_args={
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
+)
+pool_metrics.install(engine.sync_engine)
+
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+_SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+_SQL_NUMBER = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+_SQL_BIND = re.compile(r"\$\d+|%\(\w+\)s")
+_SQL_IN_LIST = re.compile(
+    r"\bIN\s*\(\s*\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)*\s*\)", re.IGNORECASE
+)
+_SQL_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse literals, bind markers and IN lists so equal queries group together."""
+    statement = _SQL_STRING.sub("?", statement)
+    statement = _SQL_BIND.sub("?", statement)
+    statement = _SQL_NUMBER.sub("?", statement)
+    statement = _SQL_IN_LIST.sub("IN (...)", statement)
+    return _SQL_SPACE.sub(" ", statement).strip()
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+
+
+# Set per request by QueryStatsMiddleware; SQLAlchemy's greenlets share the
+# request task's context, so cursor events see the same object.
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+# The start time lives on the execution context, not the connection: the
+# "after" event never fires for a statement that raises, and a per-connection
+# stack would keep an entry for each such failure.
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(_conn, _cursor, statement, _parameters, context, _executemany) -> None:
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+    if (
+        elapsed * 1000 >= settings.SLOW_QUERY_MS
+        and random.random() < settings.SLOW_QUERY_SAMPLE_RATE
+    ):
+        slow_query_logger.warning("%.1fms %s", elapsed * 1000, normalize_sql(statement))
+
+
+if settings.QUERY_STATS_ENABLED:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
 
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
@@ -12,3 +209,141 @@ class Base(DeclarativeBase):
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+InvalidationHandler = Callable[[dict[str, Any]], Awaitable[None] | None]
+ResyncHandler = Callable[[], Awaitable[None] | None]
+
+
+class InvalidationBus:
+    """Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+    Writers call :meth:`publish` inside the transaction that changes the data;
+    Postgres delivers the notification only once that transaction commits.
+    Every worker keeps one dedicated asyncpg connection listening on the
+    channel and dispatches incoming events to the handlers subscribed to the
+    event ``kind``. Events published by this worker are skipped, since it has
+    already updated its own caches. Every time the listener subscribes, the
+    first time included, resync handlers run: changes committed before the
+    subscription (while disconnected, or before the worker started listening)
+    were never notified to it.
+    """
+
+    RECONNECT_DELAY_SECONDS = 1.0
+    MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+    def __init__(self, dsn: str, channel: str) -> None:
+        self.dsn = dsn
+        self.channel = channel
+        self.sender_id = uuid4().hex
+        self._handlers: dict[str, list[InvalidationHandler]] = {}
+        self._resync_handlers: list[ResyncHandler] = []
+        self._task: asyncio.Task | None = None
+        self._background: set[asyncio.Task] = set()
+        self._subscribed = asyncio.Event()
+
+    def subscribe(self, kind: str, handler: InvalidationHandler) -> None:
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def on_resync(self, handler: ResyncHandler) -> None:
+        self._resync_handlers.append(handler)
+
+    async def publish(self, db: AsyncSession, kind: str, **data: Any) -> None:
+        payload = json.dumps(
+            {"kind": kind, "sender": self.sender_id, "data": data},
+            default=str,
+        )
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self.channel, "payload": payload},
+        )
+
+    async def start(self, timeout: float) -> None:
+        """Start listening and wait up to ``timeout`` seconds for the subscription.
+
+        If the database is unreachable the worker starts anyway; the listener
+        keeps retrying and resyncs once it gets through.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen_forever())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Invalidation listener not subscribed after %gs", timeout)
+
+    async def stop(self) -> None:
+        tasks = list(self._background)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _listen_forever(self) -> None:
+        delay = self.RECONNECT_DELAY_SECONDS
+        while True:
+            connection: asyncpg.Connection | None = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _conn: closed.set())
+                await connection.add_listener(self.channel, self._on_notification)
+                logger.info("Listening for cache invalidations on %r", self.channel)
+                delay = self.RECONNECT_DELAY_SECONDS
+                self._subscribed.set()
+                for handler in self._resync_handlers:
+                    self._run(handler)
+                await closed.wait()
+                logger.warning("Invalidation listener connection closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Invalidation listener failed, retrying in %.0fs", delay)
+            finally:
+                self._subscribed.clear()
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.MAX_RECONNECT_DELAY_SECONDS)
+
+    def _on_notification(self, _connection, _pid: int, _channel: str, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            logger.warning("Ignoring malformed invalidation payload: %r", raw)
+            return
+        if message.get("sender") == self.sender_id:
+            return
+        for handler in self._handlers.get(message.get("kind"), []):
+            self._run(handler, message.get("data") or {})
+
+    def _run(self, handler: Callable[..., Any], *args: Any) -> None:
+        try:
+            result = handler(*args)
+        except Exception:
+            logger.exception("Invalidation handler %r failed", handler)
+            return
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(self._await_logged(handler, result))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    @staticmethod
+    async def _await_logged(handler: Callable[..., Any], awaitable: Awaitable[Any]) -> None:
+        try:
+            await awaitable
+        except Exception:
+            logger.exception("Invalidation handler %r failed", handler)
+
+
+def _listener_dsn(database_url: str) -> str:
+    return make_url(database_url).set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+
+
+invalidation_bus = InvalidationBus(
+    _listener_dsn(settings.DATABASE_URL),
+    settings.INVALIDATION_CHANNEL,
+)
@@ -1,12 +1,30 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.auth import user_cache
 from app.core.config import settings
-from app.database import Base, engine
-from app.routers import cabin_admin, checkout, media, room_admin, user, user_admin
+from app.core.metrics import MetricsMiddleware, QueryStatsMiddleware, mark_worker_dead
+from app.core.rate_limit import RateLimitMiddleware
+from app.database import Base, engine, invalidation_bus
+from app.routers import (
+    availability as availability_router,
+    cabin_admin,
+    checkout,
+    media,
+    metrics,
+    pricing,
+    room_admin,
+    search,
+    system,
+    user,
+    user_admin,
+)
+from app.services import availability, catalog, media_variants, search_cache
+from app.services.pagination import NEXT_CURSOR_HEADER
 
 
 @asynccontextmanager
@@ -14,18 +32,44 @@ async def lifespan(app: FastAPI):
     if settings.AUTO_CREATE_TABLES:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+    user_cache.register_invalidation_handlers(invalidation_bus)
+    catalog.register_invalidation_handlers(invalidation_bus)
+    search_cache.register_invalidation_handlers(invalidation_bus)
+    if settings.AVAILABILITY_INDEX_ENABLED:
+        availability.register_invalidation_handlers(invalidation_bus)
+    index_loader: asyncio.Task | None = None
+    if settings.INVALIDATION_BUS_ENABLED:
+        # The index is loaded by its resync handler once the listener is
+        # subscribed, so no change committed before that is missed.
+        await invalidation_bus.start(settings.INVALIDATION_START_TIMEOUT_SECONDS)
+    elif settings.AVAILABILITY_INDEX_ENABLED:
+        # Searches fall back to SQL while the index is not ready.
+        index_loader = asyncio.create_task(availability.availability_index.reload_until_ready())
     yield
+    if index_loader is not None:
+        index_loader.cancel()
+    await invalidation_bus.stop()
+    media_variants.shutdown_executor()
+    mark_worker_dead()
 
 
 app = FastAPI(title="Resort API", lifespan=lifespan)
 
+# Added first so it runs inside CORS: 429/503 responses stay readable by browsers.
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Retry-After"],
 )
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(checkout.router)
 app.include_router(user.router)
@@ -33,6 +77,12 @@ app.include_router(user_admin.router)
 app.include_router(room_admin.router)
 app.include_router(cabin_admin.router)
 app.include_router(media.router)
+app.include_router(availability_router.router)
+app.include_router(search.router)
+app.include_router(pricing.router)
+app.include_router(system.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 
 if __name__ == "__main__":
@@ -2,3 +2,5 @@ from .checkout import *
 from .user import User, UserRole
 from .room import Room
 from .cabin import Cabin
+from .media import MediaVariant
+from .refresh_token import RefreshToken
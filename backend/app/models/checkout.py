@@ -1,4 +1,5 @@
-from sqlalchemy import CheckConstraint, ForeignKey, Index, String, Text, TIMESTAMP
+from sqlalchemy import DDL, CheckConstraint, ForeignKey, Index, String, Text, TIMESTAMP, event, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -15,8 +16,29 @@ class Booking(Base):
             "end_date",
         ),
         Index("ix_bookings_user_created", "user_id", "created_at"),
+        Index(
+            "ix_bookings_guest_email_created",
+            "email",
+            "created_at",
+            postgresql_where=text("user_id is null"),
+        ),
+        Index("ix_bookings_created_id", "created_at", "id"),
         Index("ix_bookings_room_dates", "room_id", "start_date", "end_date"),
         Index("ix_bookings_cabin_dates", "cabin_id", "start_date", "end_date"),
+        Index(
+            "ix_bookings_room_active_dates",
+            "room_id",
+            "start_date",
+            "end_date",
+            postgresql_where=text("status in ('pending', 'confirmed')"),
+        ),
+        Index(
+            "ix_bookings_cabin_active_dates",
+            "cabin_id",
+            "start_date",
+            "end_date",
+            postgresql_where=text("status in ('pending', 'confirmed')"),
+        ),
         CheckConstraint(
             "object_type in ('room', 'cabin')",
             name="ck_bookings_object_type_values",
@@ -51,6 +73,20 @@ class Booking(Base):
             "status in ('pending', 'confirmed', 'cancelled')",
             name="ck_bookings_status_values",
         ),
+        ExcludeConstraint(
+            ("room_id", "="),
+            (text("tstzrange(start_date, end_date, '[)')"), "&&"),
+            name="ex_bookings_room_no_overlap_active",
+            using="gist",
+            where=text("room_id is not null and status in ('pending', 'confirmed')"),
+        ),
+        ExcludeConstraint(
+            ("cabin_id", "="),
+            (text("tstzrange(start_date, end_date, '[)')"), "&&"),
+            name="ex_bookings_cabin_no_overlap_active",
+            using="gist",
+            where=text("cabin_id is not null and status in ('pending', 'confirmed')"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -98,4 +134,14 @@ class Booking(Base):
     # Даты
     start_date: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
     end_date: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
-    
+
+    # Стоимость проживания на момент бронирования
+    total_price: Mapped[int | None] = mapped_column(nullable=True)
+
+
+# The exclusion constraints compare integer ids with "=" inside a GiST index.
+event.listen(
+    Booking.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+)
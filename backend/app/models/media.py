@@ -0,0 +1,28 @@
+from sqlalchemy import Integer, String, TIMESTAMP, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from datetime import datetime
+
+from app.database import Base
+
+
+class MediaVariant(Base):
+    """A resized WebP rendition of an uploaded original, keyed by its R2 key."""
+
+    __tablename__ = "media_variants"
+    __table_args__ = (
+        UniqueConstraint("source_key", "width", name="uq_media_variants_source_width"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source_key: Mapped[str] = mapped_column(String(512), nullable=False)
+    file_key: Mapped[str] = mapped_column(String(512), nullable=False, unique=True)
+    width: Mapped[int] = mapped_column(Integer, nullable=False)
+    height: Mapped[int] = mapped_column(Integer, nullable=False)
+    byte_size: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -15,6 +15,7 @@ class User(Base):
     __tablename__ = 'users'
     __table_args__ = (
         Index("uq_users_email_lower", text("lower(email)"), unique=True),
+        Index("ix_users_created_id", "created_at", "id"),
     )
 
     id : Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
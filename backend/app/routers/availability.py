@@ -0,0 +1,156 @@
+from datetime import date, datetime, time, timedelta
+from typing import Literal
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+from app.database import get_db
+from app.schemas.availability import AvailabilityCalendarOut, NightRange
+from app.services.availability import ACTIVE_BOOKING_STATUSES
+
+
+router = APIRouter(prefix="/availability", tags=["Availability"])
+
+MAX_WINDOW_DAYS = 366
+MAX_BATCH_OBJECTS = 200
+
+
+def _validate_window(date_from: date, date_to: date) -> None:
+    if date_from >= date_to:
+        raise HTTPException(status_code=400, detail="from must be before to")
+    if (date_to - date_from).days > MAX_WINDOW_DAYS:
+        raise HTTPException(status_code=400, detail="Window is limited to 12 months")
+
+
+def _booked_ranges(
+    bookings: list[tuple[datetime, datetime]],
+    date_from: date,
+    date_to: date,
+    tz: ZoneInfo,
+) -> list[tuple[date, date]]:
+    """Merge bookings into sorted ``[first_night, checkout_day)`` ranges inside the window."""
+    merged: list[list[date]] = []
+    for start, end in bookings:
+        first_night = start.astimezone(tz).date()
+        checkout_day = max(end.astimezone(tz).date(), first_night + timedelta(days=1))
+        first_night = max(first_night, date_from)
+        checkout_day = min(checkout_day, date_to)
+        if first_night >= checkout_day:
+            continue
+        if merged and first_night <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], checkout_day)
+        else:
+            merged.append([first_night, checkout_day])
+    return [(first_night, checkout_day) for first_night, checkout_day in merged]
+
+
+def _build_calendar(
+    object_type: str,
+    object_id: int,
+    bookings: list[tuple[datetime, datetime]],
+    date_from: date,
+    date_to: date,
+    tz: ZoneInfo,
+) -> AvailabilityCalendarOut:
+    ranges = _booked_ranges(bookings, date_from, date_to, tz)
+
+    booked_nights: list[date] = []
+    free_nights: list[date] = []
+    cursor = date_from
+    for first_night, checkout_day in ranges:
+        free_nights.extend(cursor + timedelta(days=i) for i in range((first_night - cursor).days))
+        booked_nights.extend(
+            first_night + timedelta(days=i) for i in range((checkout_day - first_night).days)
+        )
+        cursor = checkout_day
+    free_nights.extend(cursor + timedelta(days=i) for i in range((date_to - cursor).days))
+
+    return AvailabilityCalendarOut(
+        object_type=object_type,
+        object_id=object_id,
+        date_from=date_from,
+        date_to=date_to,
+        booked_ranges=[NightRange(start=start, end=end) for start, end in ranges],
+        booked_nights=booked_nights,
+        free_nights=free_nights,
+    )
+
+
+async def _load_calendars(
+    db: AsyncSession,
+    object_type: str,
+    object_ids: list[int],
+    date_from: date,
+    date_to: date,
+) -> list[AvailabilityCalendarOut]:
+    """Calendars of the ``object_ids`` that exist, in the given order; unknown ids are left out."""
+    model = models.Room if object_type == "room" else models.Cabin
+    existing = set(
+        (await db.scalars(select(model.id).where(model.id.in_(object_ids)))).all()
+    )
+    object_ids = [object_id for object_id in object_ids if object_id in existing]
+    if not object_ids:
+        return []
+
+    tz = ZoneInfo(settings.RESORT_TIMEZONE)
+    window_start = datetime.combine(date_from, time.min, tzinfo=tz)
+    window_end = datetime.combine(date_to, time.min, tzinfo=tz)
+
+    object_column = (
+        models.Booking.room_id if object_type == "room" else models.Booking.cabin_id
+    )
+    # Single range scan on the room_id/cabin_id date indexes.
+    result = await db.execute(
+        select(object_column, models.Booking.start_date, models.Booking.end_date)
+        .where(
+            object_column.in_(object_ids),
+            models.Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+            models.Booking.start_date < window_end,
+            models.Booking.end_date > window_start,
+        )
+        .order_by(object_column, models.Booking.start_date)
+    )
+
+    bookings_by_object: dict[int, list[tuple[datetime, datetime]]] = {
+        object_id: [] for object_id in object_ids
+    }
+    for object_id, start, end in result.all():
+        bookings_by_object[object_id].append((start, end))
+
+    return [
+        _build_calendar(object_type, object_id, bookings, date_from, date_to, tz)
+        for object_id, bookings in bookings_by_object.items()
+    ]
+
+
+@router.get("/{object_type}", response_model=list[AvailabilityCalendarOut])
+async def get_availability_batch(
+    object_type: Literal["room", "cabin"],
+    ids: list[int] = Query(..., min_length=1, max_length=MAX_BATCH_OBJECTS),
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    db: AsyncSession = Depends(get_db),
+):
+    _validate_window(date_from, date_to)
+    # Ids of objects that do not exist are omitted from the response.
+    object_ids = list(dict.fromkeys(ids))
+    return await _load_calendars(db, object_type, object_ids, date_from, date_to)
+
+
+@router.get("/{object_type}/{object_id}", response_model=AvailabilityCalendarOut)
+async def get_availability(
+    object_type: Literal["room", "cabin"],
+    object_id: int,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    db: AsyncSession = Depends(get_db),
+):
+    _validate_window(date_from, date_to)
+    calendars = await _load_calendars(db, object_type, [object_id], date_from, date_to)
+    if not calendars:
+        raise HTTPException(status_code=404, detail=f"{object_type.capitalize()} not found")
+    return calendars[0]
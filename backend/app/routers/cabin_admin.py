@@ -1,54 +1,95 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import and_, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
 from app.auth.deps import get_current_admin
-from app.database import get_db
+from app.database import get_db, invalidation_bus
 from app.schemas import cabin as schemas
+from app.services.availability import ACTIVE_BOOKING_STATUSES, availability_index
+from app.services.catalog import cabin_catalog, catalog_response
+from app.services.pagination import MAX_PAGE_SIZE, StreamFormat, list_with_keyset
+from app.services.pricing import Quote, count_nights
+from app.services.search_cache import search_cache
 
 
 router = APIRouter(prefix="/cabin_admin", tags=["Admin"])
 
 
-def _build_cabin_search_query(payload: schemas.SearchRequest):
-    total_guests = sum(g.adults + g.children for g in payload.guests)
-
-    overlap_exists = (
-        select(models.Booking.id)
-        .where(
+def _build_cabin_search_query(start_date, end_date, total_guests: int):
+    # Anti-join on cabin_id, served by the partial ix_bookings_cabin_active_dates.
+    return (
+        select(models.Cabin)
+        .outerjoin(
+            models.Booking,
             and_(
-                models.Booking.object_type == "cabin",
-                models.Booking.object_id == models.Cabin.id,
-                models.Booking.status.in_(["pending", "confirmed"]),
-                models.Booking.start_date < payload.endDate,
-                models.Booking.end_date > payload.startDate,
-            )
+                models.Booking.cabin_id == models.Cabin.id,
+                models.Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+                models.Booking.start_date < end_date,
+                models.Booking.end_date > start_date,
+            ),
+        )
+        .where(
+            models.Cabin.beds >= total_guests,
+            models.Booking.cabin_id.is_(None),
         )
-        .exists()
     )
 
-    return select(models.Cabin).where(
-        models.Cabin.beds >= total_guests,
-        ~overlap_exists,
-    )
+
+async def _search_cabins(db: AsyncSession, start_date, end_date, total_guests: int):
+    key = search_cache.key("cabin", start_date, end_date, total_guests)
+    cabin_ids = search_cache.get(key)
+    if cabin_ids is None:
+        generation = search_cache.generation
+        if availability_index.ready:
+            cabin_ids = availability_index.free_objects("cabin", start_date, end_date, total_guests)
+        else:
+            result = await db.execute(
+                _build_cabin_search_query(start_date, end_date, total_guests)
+                .with_only_columns(models.Cabin.id)
+                .order_by(models.Cabin.id)
+            )
+            cabin_ids = result.scalars().all()
+        search_cache.put(key, cabin_ids, generation)
+
+    catalog = await cabin_catalog.get_including(cabin_ids)
+    nights = count_nights(start_date, end_date)
+    return [
+        schemas.CabinSearchOut.model_construct(
+            **dict(item),
+            total_price=Quote(nights, item.price_weekdays, item.price_weekend).total,
+        )
+        for cabin_id in cabin_ids
+        if (item := catalog.items.get(cabin_id)) is not None
+    ]
 
 
 @router.get("/", response_model=list[schemas.CabinOut])
 async def get_cabins(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    stream: StreamFormat | None = None,
     db: AsyncSession = Depends(get_db),
     _admin: models.User = Depends(get_current_admin),
 ):
-    result = await db.execute(select(models.Cabin))
-    return result.scalars().all()
+    return await list_with_keyset(
+        db,
+        select(models.Cabin),
+        models.Cabin,
+        schemas.CabinOut,
+        response,
+        limit=limit,
+        cursor=cursor,
+        stream=stream,
+    )
 
 
 @router.get("/public", response_model=list[schemas.CabinOut])
-async def get_cabins_public(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Cabin))
-    return result.scalars().all()
+async def get_cabins_public(request: Request):
+    return await catalog_response(cabin_catalog, request)
 
 
 @router.post("/", response_model=schemas.CabinOut)
@@ -59,8 +100,13 @@ async def create_cabin(
 ):
     db_cabin = models.Cabin(**cabin.model_dump(by_alias=False))
     db.add(db_cabin)
+    await db.flush()
+    await invalidation_bus.publish(db, "cabin", id=db_cabin.id, capacity=db_cabin.beds)
     await db.commit()
     await db.refresh(db_cabin)
+    availability_index.set_object("cabin", db_cabin.id, db_cabin.beds)
+    cabin_catalog.invalidate()
+    search_cache.invalidate_type("cabin")
     return db_cabin
 
 
@@ -82,7 +128,11 @@ async def update_cabin(
     if updated is None:
         raise HTTPException(404, detail="Cabin not found")
 
+    await invalidation_bus.publish(db, "cabin", id=updated.id, capacity=updated.beds)
     await db.commit()
+    availability_index.set_object("cabin", updated.id, updated.beds)
+    cabin_catalog.invalidate()
+    search_cache.invalidate_type("cabin")
     return updated
 
 
@@ -94,13 +144,18 @@ async def delete_cabin(
 ):
     query = delete(models.Cabin).where(models.Cabin.id == cabin_id)
     result = await db.execute(query)
+    if result.rowcount:
+        await invalidation_bus.publish(db, "cabin", id=cabin_id, deleted=True)
     await db.commit()
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Cabin not found")
+    availability_index.drop_object("cabin", cabin_id)
+    cabin_catalog.invalidate()
+    search_cache.invalidate_type("cabin")
     return {"message": "Cabin deleted"}
 
 
-@router.post("/search", response_model=List[schemas.CabinOut])
+@router.post("/search", response_model=List[schemas.CabinSearchOut])
 async def search_cabins(
     payload: schemas.SearchRequest,
     db: AsyncSession = Depends(get_db),
@@ -109,13 +164,11 @@ async def search_cabins(
     if payload.startDate >= payload.endDate:
         raise HTTPException(status_code=400, detail="startDate must be before endDate")
 
-    query = _build_cabin_search_query(payload)
-
-    result = await db.execute(query)
-    return result.scalars().all()
+    total_guests = sum(g.adults + g.children for g in payload.guests)
+    return await _search_cabins(db, payload.startDate, payload.endDate, total_guests)
 
 
-@router.post("/public/search", response_model=List[schemas.CabinOut])
+@router.post("/public/search", response_model=List[schemas.CabinSearchOut])
 async def search_cabins_public(
     payload: schemas.SearchRequest,
     db: AsyncSession = Depends(get_db),
@@ -123,6 +176,5 @@ async def search_cabins_public(
     if payload.startDate >= payload.endDate:
         raise HTTPException(status_code=400, detail="startDate must be before endDate")
 
-    query = _build_cabin_search_query(payload)
-    result = await db.execute(query)
-    return result.scalars().all()
+    total_guests = sum(g.adults + g.children for g in payload.guests)
+    return await _search_cabins(db, payload.startDate, payload.endDate, total_guests)
@@ -1,14 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import and_, or_, select, update
+from datetime import datetime
+from typing import Literal
+
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert, select, union_all, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.auth.deps import get_current_admin, get_current_user
-from app.database import get_db
+from app.database import get_db, invalidation_bus
+from app.services import booking_io
+from app.services.availability import availability_index, booking_event
+from app.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    StreamFormat,
+    apply_keyset,
+    encode_cursor,
+    list_with_keyset,
+)
+from app.services.pricing import count_nights, stay_price_expression
+from app.services.search_cache import search_cache
 
 
 router = APIRouter(prefix="/checkout", tags=["Booking"])
 
+FOREIGN_KEY_VIOLATION = "23503"
+EXCLUSION_VIOLATION = "23P01"
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
 
 def _ensure_admin(user: models.User) -> None:
     if user.role != "admin":
@@ -29,32 +52,10 @@ async def create_booking(
 
     room_id: int | None = None
     cabin_id: int | None = None
-
     if booking.object_type == "room":
         room_id = booking.object_id
-        obj_exists = await db.execute(select(models.Room.id).where(models.Room.id == room_id))
     else:
         cabin_id = booking.object_id
-        obj_exists = await db.execute(select(models.Cabin.id).where(models.Cabin.id == cabin_id))
-
-    if obj_exists.scalar_one_or_none() is None:
-        raise HTTPException(status_code=404, detail="Object not found")
-
-    overlap_filter = [
-        models.checkout.Booking.status.in_(["pending", "confirmed"]),
-        models.checkout.Booking.start_date < booking.end_date,
-        models.checkout.Booking.end_date > booking.start_date,
-    ]
-    if room_id is not None:
-        overlap_filter.append(models.checkout.Booking.room_id == room_id)
-    else:
-        overlap_filter.append(models.checkout.Booking.cabin_id == cabin_id)
-
-    overlap = await db.execute(
-        select(models.checkout.Booking.id).where(and_(*overlap_filter))
-    )
-    if overlap.scalar_one_or_none() is not None:
-        raise HTTPException(status_code=409, detail="Selected dates are not available")
 
     payload = booking.model_dump()
     payload["status"] = "pending"
@@ -62,72 +63,179 @@ async def create_booking(
     payload["email"] = current_user.email
     payload["room_id"] = room_id
     payload["cabin_id"] = cabin_id
+    # Quoted in the INSERT itself from the object's current prices.
+    priced_model = models.Room if booking.object_type == "room" else models.Cabin
+    payload["total_price"] = (
+        select(
+            stay_price_expression(
+                priced_model, count_nights(booking.start_date, booking.end_date)
+            )
+        )
+        .where(priced_model.id == booking.object_id)
+        .scalar_subquery()
+    )
 
-    db_booking = models.checkout.Booking(**payload)
-    db.add(db_booking)
-    await db.commit()
-    await db.refresh(db_booking)
+    # Object existence and overlaps are enforced by the room/cabin foreign keys
+    # and the ex_bookings_*_no_overlap_active exclusion constraints, so the
+    # booking is a single INSERT ... RETURNING without a racy pre-check.
+    try:
+        result = await db.execute(
+            insert(models.checkout.Booking).values(**payload).returning(models.checkout.Booking)
+        )
+        db_booking = result.scalar_one()
+        await invalidation_bus.publish(db, "booking", **booking_event(db_booking))
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        sqlstate = getattr(exc.orig, "sqlstate", None)
+        if sqlstate == EXCLUSION_VIOLATION:
+            raise HTTPException(
+                status_code=409, detail="Selected dates are not available"
+            ) from exc
+        if sqlstate == FOREIGN_KEY_VIOLATION:
+            raise HTTPException(status_code=404, detail="Object not found") from exc
+        raise
+
+    availability_index.apply_booking(db_booking)
+    search_cache.invalidate_range(
+        db_booking.object_type, db_booking.start_date, db_booking.end_date
+    )
     return db_booking
 
 
 @router.get("/", response_model=list[schemas.checkout.BookingOut])
 async def get_bookings(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    stream: StreamFormat | None = None,
+    booking_status: Literal["pending", "confirmed", "cancelled"] | None = Query(
+        None, alias="status"
+    ),
+    object_type: Literal["room", "cabin"] | None = None,
+    object_id: int | None = None,
+    date_from: datetime | None = Query(None, alias="from"),
+    date_to: datetime | None = Query(None, alias="to"),
     db: AsyncSession = Depends(get_db),
     _admin: models.User = Depends(get_current_admin),
 ):
-    result = await db.execute(select(models.checkout.Booking))
-    return result.scalars().all()
+    Booking = models.checkout.Booking
+    query = select(Booking)
+    if booking_status is not None:
+        query = query.where(Booking.status == booking_status)
+    if object_type is not None:
+        query = query.where(Booking.object_type == object_type)
+    if object_id is not None:
+        query = query.where(Booking.object_id == object_id)
+    # Date filters select stays overlapping [from, to).
+    if date_from is not None:
+        query = query.where(Booking.end_date > date_from)
+    if date_to is not None:
+        query = query.where(Booking.start_date < date_to)
+
+    return await list_with_keyset(
+        db,
+        query,
+        Booking,
+        schemas.checkout.BookingOut,
+        response,
+        limit=limit,
+        cursor=cursor,
+        stream=stream,
+    )
 
 
-@router.get("/my", response_model=list[schemas.checkout.MyBookingOut])
-async def get_my_bookings(
+@router.post("/admin/import", response_model=schemas.checkout.BookingImportReport)
+async def import_bookings(
+    request: Request,
+    fmt: booking_io.BookingFormat | None = Query(None, alias="format"),
+    dry_run: bool = False,
+    atomic: bool = False,
     db: AsyncSession = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    _admin: models.User = Depends(get_current_admin),
 ):
-    result = await db.execute(
-        select(models.checkout.Booking)
-        .where(
-            or_(
-                models.checkout.Booking.user_id == current_user.id,
-                and_(
-                    models.checkout.Booking.user_id.is_(None),
-                    models.checkout.Booking.email == current_user.email,
-                ),
-            )
-        )
-        .order_by(models.checkout.Booking.created_at.desc())
-    )
-    bookings = result.scalars().all()
+    if fmt is None:
+        content_type = request.headers.get("content-type", "")
+        fmt = "ndjson" if "ndjson" in content_type or "json" in content_type else "csv"
+    try:
+        data = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8")
+
+    rows = booking_io.parse_bookings(data, fmt)
+    try:
+        report = await booking_io.import_bookings(db, rows, dry_run=dry_run, atomic=atomic)
+        if report.imported:
+            await invalidation_bus.publish(db, "booking_import", imported=report.imported)
+            await db.commit()
+    except asyncpg.exceptions.IntegrityConstraintViolationError as exc:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Bookings changed during import, retry the batch"
+        ) from exc
 
-    room_ids = [b.room_id for b in bookings if b.room_id is not None]
-    cabin_ids = [b.cabin_id for b in bookings if b.cabin_id is not None]
+    if report.imported:
+        await availability_index.reload()
+        search_cache.clear()
+    return report
 
-    room_titles: dict[int, str] = {}
-    cabin_titles: dict[int, str] = {}
 
-    if room_ids:
-        rooms = await db.execute(
-            select(models.Room.id, models.Room.title).where(models.Room.id.in_(room_ids))
-        )
-        room_titles = {row.id: row.title for row in rooms.all()}
+@router.get("/admin/export")
+async def export_bookings(
+    fmt: booking_io.BookingFormat = Query("csv", alias="format"),
+    _admin: models.User = Depends(get_current_admin),
+):
+    return StreamingResponse(
+        booking_io.export_bookings(fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="bookings.{fmt}"'},
+    )
+
+
+def _my_bookings_query(user: models.User, cursor: str | None, limit: int | None):
+    """Bookings of ``user`` with the object title, in one statement.
+
+    The ``user_id = X OR (user_id IS NULL AND email = Y)`` predicate is split
+    into a ``UNION ALL`` so each branch is a keyset scan of its own index:
+    ``ix_bookings_user_created`` and ``ix_bookings_guest_email_created``.
+    """
+    Booking = models.checkout.Booking
+    own = select(Booking).where(Booking.user_id == user.id)
+    # Guest bookings made with the account email before signing up.
+    guest = select(Booking).where(Booking.user_id.is_(None), Booking.email == user.email)
+    mine = union_all(
+        *(apply_keyset(branch, Booking, cursor, limit) for branch in (own, guest))
+    ).subquery("mine")
+
+    query = (
+        select(mine, func.coalesce(models.Room.title, models.Cabin.title).label("object_title"))
+        .outerjoin(models.Room, models.Room.id == mine.c.room_id)
+        .outerjoin(models.Cabin, models.Cabin.id == mine.c.cabin_id)
+        .order_by(mine.c.created_at.desc(), mine.c.id.desc())
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return query
 
-    if cabin_ids:
-        cabins = await db.execute(
-            select(models.Cabin.id, models.Cabin.title).where(models.Cabin.id.in_(cabin_ids))
-        )
-        cabin_titles = {row.id: row.title for row in cabins.all()}
-
-    response: list[schemas.checkout.MyBookingOut] = []
-    for booking in bookings:
-        object_title = (
-            room_titles.get(booking.room_id)
-            if booking.object_type == "room"
-            else cabin_titles.get(booking.cabin_id)
-        )
-        item = schemas.checkout.MyBookingOut.model_validate(booking)
-        response.append(item.model_copy(update={"object_title": object_title}))
 
-    return response
+@router.get("/my", response_model=list[schemas.checkout.MyBookingOut])
+async def get_my_bookings(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    paginate = limit is not None or cursor is not None
+    page_size = limit or DEFAULT_PAGE_SIZE
+    result = await db.execute(
+        _my_bookings_query(current_user, cursor, page_size + 1 if paginate else None)
+    )
+    rows = result.all()
+    if paginate and len(rows) > page_size:
+        rows = rows[:page_size]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return [schemas.checkout.MyBookingOut.model_validate(row) for row in rows]
 
 
 @router.patch("/admin/{booking_id}/status", response_model=schemas.checkout.BookingOut)
@@ -149,7 +257,10 @@ async def admin_update_booking_status(
     if booking is None:
         raise HTTPException(status_code=404, detail="Booking not found")
 
+    await invalidation_bus.publish(db, "booking", **booking_event(booking))
     await db.commit()
+    availability_index.apply_booking(booking)
+    search_cache.invalidate_range(booking.object_type, booking.start_date, booking.end_date)
     return booking
 
 
@@ -171,5 +282,8 @@ async def delete_booking(
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     await db.delete(booking)
+    await invalidation_bus.publish(db, "booking", **booking_event(booking), deleted=True)
     await db.commit()
+    availability_index.remove_booking(booking_id)
+    search_cache.invalidate_range(booking.object_type, booking.start_date, booking.end_date)
     return {"message": f"Booking {booking_id} deleted successfully"}
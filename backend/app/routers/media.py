@@ -1,40 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from concurrent.futures.process import BrokenProcessPool
+
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
 from app.auth.deps import get_current_admin
+from app.core.config import settings
+from app.database import get_db, invalidation_bus
 from app.schemas.media import (
+    CompleteUploadItem,
+    CompleteUploadRequest,
+    CompleteUploadResponse,
+    DeleteMediaBatchRequest,
+    DeleteMediaBatchResponse,
     DeleteMediaRequest,
     DeleteMediaResponse,
+    MediaGcReport,
+    MediaVariantOut,
+    PresignUploadBatchRequest,
+    PresignUploadBatchResponse,
     PresignUploadRequest,
     PresignUploadResponse,
 )
-from app.services import r2
+from app.services import media_gc, media_variants, r2
+from app.services.catalog import invalidate_catalogs
 
 
 router = APIRouter(prefix="/media", tags=["Media"])
 
 
+def _presign(payload: PresignUploadRequest) -> PresignUploadResponse:
+    data = r2.create_presigned_upload(
+        filename=payload.filename,
+        content_type=payload.content_type,
+        folder=payload.folder,
+        file_size=payload.file_size,
+    )
+    return PresignUploadResponse(
+        upload_url=data["upload_url"],
+        file_key=data["file_key"],
+        public_url=data["public_url"],
+        required_headers={
+            "Content-Type": data["content_type"],
+            "Cache-Control": data["cache_control"],
+        },
+    )
+
+
 @router.post("/presign-upload", response_model=PresignUploadResponse)
 async def presign_upload(
     payload: PresignUploadRequest,
     _admin: models.User = Depends(get_current_admin),
 ):
     try:
-        data = r2.create_presigned_upload(
-            filename=payload.filename,
-            content_type=payload.content_type,
-            folder=payload.folder,
-            file_size=payload.file_size,
-        )
-        return PresignUploadResponse(
-            upload_url=data["upload_url"],
-            file_key=data["file_key"],
-            public_url=data["public_url"],
-            required_headers={
-                "Content-Type": data["content_type"],
-                "Cache-Control": data["cache_control"],
-            },
-        )
+        return _presign(payload)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -44,16 +64,150 @@ async def presign_upload(
         ) from exc
 
 
+@router.post("/presign-upload-batch", response_model=PresignUploadBatchResponse)
+async def presign_upload_batch(
+    payload: PresignUploadBatchRequest,
+    _admin: models.User = Depends(get_current_admin),
+):
+    # Signing is local HMAC work with the cached client; no storage round trip.
+    items: list[PresignUploadResponse] = []
+    for index, file in enumerate(payload.files):
+        try:
+            items.append(_presign(file))
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"files[{index}] ({file.filename}): {exc}",
+            ) from exc
+        except RuntimeError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Media storage is not configured",
+            ) from exc
+    return PresignUploadBatchResponse(items=items)
+
+
+@router.post("/complete-upload", response_model=CompleteUploadResponse)
+async def complete_upload(
+    payload: CompleteUploadRequest,
+    db: AsyncSession = Depends(get_db),
+    _admin: models.User = Depends(get_current_admin),
+):
+    """Create the WebP variants of uploaded originals and record their manifest."""
+    try:
+        manifest = await media_variants.generate_variants(db, payload.keys)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except BrokenProcessPool as exc:
+        # A RuntimeError subclass, so it must be handled before the one below.
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Image processing worker crashed, please retry",
+        ) from exc
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Media storage is not configured",
+        ) from exc
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404"}:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Uploaded file not found"
+            ) from exc
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Media storage request failed",
+        ) from exc
+    except BotoCoreError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Media storage request failed",
+        ) from exc
+    await invalidation_bus.publish(db, "media", keys=list(manifest))
+    await db.commit()
+    invalidate_catalogs()
+    return CompleteUploadResponse(
+        items=[
+            CompleteUploadItem(
+                key=key,
+                srcset=media_variants.build_srcset(variants),
+                variants=[
+                    MediaVariantOut(
+                        url=r2.public_url(variant.file_key),
+                        width=variant.width,
+                        height=variant.height,
+                        byte_size=variant.byte_size,
+                    )
+                    for variant in variants
+                ],
+            )
+            for key, variants in manifest.items()
+        ]
+    )
+
+
 @router.post("/delete", response_model=DeleteMediaResponse)
 async def delete_media(
     payload: DeleteMediaRequest,
     _admin: models.User = Depends(get_current_admin),
 ):
     try:
-        r2.delete_file(payload.key)
+        await r2.delete_file(payload.key)
     except RuntimeError as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Media storage is not configured",
         ) from exc
+    except (BotoCoreError, ClientError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Media storage request failed",
+        ) from exc
     return DeleteMediaResponse(success=True)
+
+
+@router.post("/delete-batch", response_model=DeleteMediaBatchResponse)
+async def delete_media_batch(
+    payload: DeleteMediaBatchRequest,
+    _admin: models.User = Depends(get_current_admin),
+):
+    try:
+        deleted, errors = await r2.delete_files(payload.keys)
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Media storage is not configured",
+        ) from exc
+    except (BotoCoreError, ClientError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Media storage request failed",
+        ) from exc
+    return DeleteMediaBatchResponse(success=not errors, deleted=deleted, errors=errors)
+
+
+@router.post("/gc", response_model=MediaGcReport)
+async def collect_media_garbage(
+    dry_run: bool = True,
+    grace_hours: float = Query(default=settings.MEDIA_GC_GRACE_HOURS, ge=0),
+    prefix: str = "",
+    db: AsyncSession = Depends(get_db),
+    _admin: models.User = Depends(get_current_admin),
+):
+    """Find (and unless ``dry_run``, delete) objects no gallery refers to."""
+    try:
+        report = await media_gc.collect_garbage(
+            db, dry_run=dry_run, grace_hours=grace_hours, prefix=prefix
+        )
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Media storage is not configured",
+        ) from exc
+    except (BotoCoreError, ClientError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Media storage request failed",
+        ) from exc
+    await db.commit()
+    return report
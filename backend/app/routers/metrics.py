@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_metrics
+
+
+router = APIRouter(tags=["System"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException
+
+from app import schemas
+from app.services.catalog import cabin_catalog, room_catalog
+from app.services.pricing import quote
+
+
+router = APIRouter(prefix="/pricing", tags=["Pricing"])
+
+
+@router.post("/quote", response_model=list[schemas.QuoteOut])
+async def quote_stays(payload: schemas.QuoteRequest):
+    # Prices come from the catalog snapshot, so quoting does not hit the database.
+    catalogs = {"room": await room_catalog.get(), "cabin": await cabin_catalog.get()}
+
+    quotes: list[schemas.QuoteOut] = []
+    for item in payload.items:
+        if item.start_date >= item.end_date:
+            raise HTTPException(status_code=400, detail="startDate must be before endDate")
+        obj = catalogs[item.object_type].items.get(item.object_id)
+        if obj is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"{item.object_type} {item.object_id} not found",
+            )
+        stay = quote(obj.price_weekdays, obj.price_weekend, item.start_date, item.end_date)
+        quotes.append(
+            schemas.QuoteOut(
+                **item.model_dump(),
+                nights=stay.nights.total,
+                weekday_nights=stay.nights.weekday,
+                weekend_nights=stay.nights.weekend,
+                price_weekdays=stay.price_weekdays,
+                price_weekend=stay.price_weekend,
+                weekday_total=stay.weekday_total,
+                weekend_total=stay.weekend_total,
+                total_price=stay.total,
+            )
+        )
+    return quotes
@@ -1,53 +1,100 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import and_, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.auth.deps import get_current_admin
-from app.database import get_db
+from app.database import get_db, invalidation_bus
+from app.services.availability import ACTIVE_BOOKING_STATUSES, availability_index
+from app.services.catalog import catalog_response, room_catalog
+from app.services.pagination import MAX_PAGE_SIZE, StreamFormat, list_with_keyset
+from app.services.pricing import Quote, count_nights
+from app.services.search_cache import search_cache
 
 
 router = APIRouter(prefix="/room_admin", tags=["Admin"])
 
 
-def _build_room_search_query(payload: schemas.room.SearchRequestRoom):
-    total_guests = sum(g.adults + g.children for g in payload.guests)
-
-    overlap_exists = (
-        select(models.Booking.id)
-        .where(
+def _build_room_search_query(start_date, end_date, total_guests: int):
+    # Anti-join on room_id, served by the partial ix_bookings_room_active_dates.
+    return (
+        select(models.Room)
+        .outerjoin(
+            models.Booking,
             and_(
-                models.Booking.object_type == "room",
-                models.Booking.object_id == models.Room.id,
-                models.Booking.status.in_(["pending", "confirmed"]),
-                models.Booking.start_date < payload.endDate,
-                models.Booking.end_date > payload.startDate,
-            )
+                models.Booking.room_id == models.Room.id,
+                models.Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+                models.Booking.start_date < end_date,
+                models.Booking.end_date > start_date,
+            ),
+        )
+        .where(
+            func.coalesce(models.Room.capacity, models.Room.beds, 0) >= total_guests,
+            models.Booking.room_id.is_(None),
         )
-        .exists()
     )
 
-    return select(models.Room).where(
-        func.coalesce(models.Room.capacity, models.Room.beds, 0) >= total_guests,
-        ~overlap_exists,
-    )
+
+def _room_capacity(room: models.Room) -> int:
+    if room.capacity is not None:
+        return room.capacity
+    return room.beds or 0
+
+
+async def _search_rooms(db: AsyncSession, start_date, end_date, total_guests: int):
+    key = search_cache.key("room", start_date, end_date, total_guests)
+    room_ids = search_cache.get(key)
+    if room_ids is None:
+        generation = search_cache.generation
+        if availability_index.ready:
+            room_ids = availability_index.free_objects("room", start_date, end_date, total_guests)
+        else:
+            result = await db.execute(
+                _build_room_search_query(start_date, end_date, total_guests)
+                .with_only_columns(models.Room.id)
+                .order_by(models.Room.id)
+            )
+            room_ids = result.scalars().all()
+        search_cache.put(key, room_ids, generation)
+
+    catalog = await room_catalog.get_including(room_ids)
+    nights = count_nights(start_date, end_date)
+    return [
+        schemas.RoomSearchOut.model_construct(
+            **dict(item),
+            total_price=Quote(nights, item.price_weekdays, item.price_weekend).total,
+        )
+        for room_id in room_ids
+        if (item := catalog.items.get(room_id)) is not None
+    ]
 
 
 @router.get("/", response_model=list[schemas.RoomOut])
 async def get_rooms(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    stream: StreamFormat | None = None,
     db: AsyncSession = Depends(get_db),
     _admin: models.User = Depends(get_current_admin),
 ):
-    result = await db.execute(select(models.Room))
-    return result.scalars().all()
+    return await list_with_keyset(
+        db,
+        select(models.Room),
+        models.Room,
+        schemas.RoomOut,
+        response,
+        limit=limit,
+        cursor=cursor,
+        stream=stream,
+    )
 
 
 @router.get("/public", response_model=list[schemas.RoomOut])
-async def get_rooms_public(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Room))
-    return result.scalars().all()
+async def get_rooms_public(request: Request):
+    return await catalog_response(room_catalog, request)
 
 
 @router.post("/", response_model=schemas.room.RoomOut)
@@ -58,8 +105,15 @@ async def create_room(
 ):
     db_room = models.Room(**room.model_dump(by_alias=False))
     db.add(db_room)
+    await db.flush()
+    await invalidation_bus.publish(
+        db, "room", id=db_room.id, capacity=_room_capacity(db_room)
+    )
     await db.commit()
     await db.refresh(db_room)
+    availability_index.set_object("room", db_room.id, _room_capacity(db_room))
+    room_catalog.invalidate()
+    search_cache.invalidate_type("room")
     return db_room
 
 
@@ -81,7 +135,13 @@ async def update_room(
     if updated is None:
         raise HTTPException(404, detail="Room not found")
 
+    await invalidation_bus.publish(
+        db, "room", id=updated.id, capacity=_room_capacity(updated)
+    )
     await db.commit()
+    availability_index.set_object("room", updated.id, _room_capacity(updated))
+    room_catalog.invalidate()
+    search_cache.invalidate_type("room")
     return updated
 
 
@@ -93,13 +153,18 @@ async def delete_room(
 ):
     query = delete(models.Room).where(models.Room.id == room_id)
     result = await db.execute(query)
+    if result.rowcount:
+        await invalidation_bus.publish(db, "room", id=room_id, deleted=True)
     await db.commit()
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Room not found")
+    availability_index.drop_object("room", room_id)
+    room_catalog.invalidate()
+    search_cache.invalidate_type("room")
     return {"message": "Room deleted"}
 
 
-@router.post("/search", response_model=List[schemas.RoomOut])
+@router.post("/search", response_model=List[schemas.RoomSearchOut])
 async def search_rooms(
     payload: schemas.room.SearchRequestRoom,
     db: AsyncSession = Depends(get_db),
@@ -108,13 +173,11 @@ async def search_rooms(
     if payload.startDate >= payload.endDate:
         raise HTTPException(status_code=400, detail="startDate must be before endDate")
 
-    query = _build_room_search_query(payload)
-
-    result = await db.execute(query)
-    return result.scalars().all()
+    total_guests = sum(g.adults + g.children for g in payload.guests)
+    return await _search_rooms(db, payload.startDate, payload.endDate, total_guests)
 
 
-@router.post("/public/search", response_model=List[schemas.RoomOut])
+@router.post("/public/search", response_model=List[schemas.RoomSearchOut])
 async def search_rooms_public(
     payload: schemas.room.SearchRequestRoom,
     db: AsyncSession = Depends(get_db),
@@ -122,12 +185,11 @@ async def search_rooms_public(
     if payload.startDate >= payload.endDate:
         raise HTTPException(status_code=400, detail="startDate must be before endDate")
 
-    query = _build_room_search_query(payload)
-    result = await db.execute(query)
-    return result.scalars().all()
+    total_guests = sum(g.adults + g.children for g in payload.guests)
+    return await _search_rooms(db, payload.startDate, payload.endDate, total_guests)
 
 
-@router.post("/c", response_model=List[schemas.RoomOut])
+@router.post("/c", response_model=List[schemas.RoomSearchOut])
 async def quick_search_rooms(
     payload: schemas.room.QuickSearchRequest,
     db: AsyncSession = Depends(get_db),
@@ -137,31 +199,10 @@ async def quick_search_rooms(
         raise HTTPException(status_code=400, detail="startDate must be before endDate")
 
     total_guests = payload.adults + payload.children
+    return await _search_rooms(db, payload.startDate, payload.endDate, total_guests)
 
-    overlap_exists = (
-        select(models.Booking.id)
-        .where(
-            and_(
-                models.Booking.object_type == "room",
-                models.Booking.object_id == models.Room.id,
-                models.Booking.status.in_(["pending", "confirmed"]),
-                models.Booking.start_date < payload.endDate,
-                models.Booking.end_date > payload.startDate,
-            )
-        )
-        .exists()
-    )
-
-    query = select(models.Room).where(
-        func.coalesce(models.Room.capacity, models.Room.beds, 0) >= total_guests,
-        ~overlap_exists,
-    )
-
-    result = await db.execute(query)
-    return result.scalars().all()
 
-
-@router.post("/public/c", response_model=List[schemas.RoomOut])
+@router.post("/public/c", response_model=List[schemas.RoomSearchOut])
 async def quick_search_rooms_public(
     payload: schemas.room.QuickSearchRequest,
     db: AsyncSession = Depends(get_db),
@@ -170,25 +211,4 @@ async def quick_search_rooms_public(
         raise HTTPException(status_code=400, detail="startDate must be before endDate")
 
     total_guests = payload.adults + payload.children
-
-    overlap_exists = (
-        select(models.Booking.id)
-        .where(
-            and_(
-                models.Booking.object_type == "room",
-                models.Booking.object_id == models.Room.id,
-                models.Booking.status.in_(["pending", "confirmed"]),
-                models.Booking.start_date < payload.endDate,
-                models.Booking.end_date > payload.startDate,
-            )
-        )
-        .exists()
-    )
-
-    query = select(models.Room).where(
-        func.coalesce(models.Room.capacity, models.Room.beds, 0) >= total_guests,
-        ~overlap_exists,
-    )
-
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await _search_rooms(db, payload.startDate, payload.endDate, total_guests)
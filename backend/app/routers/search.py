@@ -0,0 +1,133 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import false, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.database import get_db
+from app.routers.cabin_admin import _build_cabin_search_query
+from app.routers.room_admin import _build_room_search_query
+from app.services.catalog import cabin_catalog, room_catalog
+from app.services.pricing import NightCount, count_nights, stay_price_expression
+
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def _build_unified_search_query(
+    payload: schemas.UnifiedSearchRequest,
+    total_guests: int,
+    nights: NightCount,
+):
+    """Free rooms and cabins as one ``UNION ALL`` with a common column set.
+
+    Each branch is the per-type anti-join search; filters on the union are
+    pushed down into both branches by the planner.
+    """
+    rooms = _build_room_search_query(
+        payload.start_date, payload.end_date, total_guests
+    ).with_only_columns(
+        literal("room").label("object_type"),
+        models.Room.id.label("object_id"),
+        models.Room.category.label("category"),
+        func.coalesce(models.Room.tv, false()).label("tv"),
+        literal(False).label("pool"),
+        stay_price_expression(models.Room, nights).label("total_price"),
+    )
+    cabins = _build_cabin_search_query(
+        payload.start_date, payload.end_date, total_guests
+    ).with_only_columns(
+        literal("cabin").label("object_type"),
+        models.Cabin.id.label("object_id"),
+        models.Cabin.category.label("category"),
+        literal(False).label("tv"),
+        func.coalesce(models.Cabin.pool, false()).label("pool"),
+        stay_price_expression(models.Cabin, nights).label("total_price"),
+    )
+    hits = union_all(rooms, cabins).subquery("hits")
+
+    query = select(hits.c.object_type, hits.c.object_id, hits.c.total_price)
+    if payload.object_type is not None:
+        query = query.where(hits.c.object_type == payload.object_type)
+    if payload.category is not None:
+        query = query.where(hits.c.category == payload.category)
+    if payload.pool is not None:
+        query = query.where(hits.c.pool.is_(payload.pool))
+    if payload.tv is not None:
+        query = query.where(hits.c.tv.is_(payload.tv))
+    if payload.min_price is not None:
+        query = query.where(hits.c.total_price >= payload.min_price)
+    if payload.max_price is not None:
+        query = query.where(hits.c.total_price <= payload.max_price)
+    return query
+
+
+@router.post("", response_model=schemas.SearchPage)
+async def search(
+    payload: schemas.UnifiedSearchRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    if payload.start_date >= payload.end_date:
+        raise HTTPException(status_code=400, detail="startDate must be before endDate")
+    if (
+        payload.min_price is not None
+        and payload.max_price is not None
+        and payload.min_price > payload.max_price
+    ):
+        raise HTTPException(status_code=400, detail="minPrice must not exceed maxPrice")
+
+    total_guests = sum(g.adults + g.children for g in payload.guests)
+    nights = count_nights(payload.start_date, payload.end_date)
+    query = _build_unified_search_query(payload, total_guests, nights)
+
+    price_order = (
+        query.selected_columns.total_price.desc()
+        if payload.sort == "price_desc"
+        else query.selected_columns.total_price.asc()
+    )
+    result = await db.execute(
+        query.add_columns(func.count().over().label("total"))
+        .order_by(
+            price_order,
+            query.selected_columns.object_type,
+            query.selected_columns.object_id,
+        )
+        .limit(payload.page_size)
+        .offset((payload.page - 1) * payload.page_size)
+    )
+    rows = result.all()
+    if rows:
+        total = rows[0].total
+    elif payload.page > 1:
+        # Past the last page: the window count has no row to ride on.
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    else:
+        total = 0
+
+    catalogs = {
+        "room": await room_catalog.get_including(
+            row.object_id for row in rows if row.object_type == "room"
+        ),
+        "cabin": await cabin_catalog.get_including(
+            row.object_id for row in rows if row.object_type == "cabin"
+        ),
+    }
+    items = [
+        schemas.SearchHit(
+            object_type=row.object_type,
+            object_id=row.object_id,
+            total_price=row.total_price,
+            item=catalogs[row.object_type].items[row.object_id],
+        )
+        for row in rows
+        if row.object_id in catalogs[row.object_type].items
+    ]
+    return schemas.SearchPage(
+        items=items,
+        # Hits still missing were deleted after the search ran.
+        total=total - (len(rows) - len(items)),
+        page=payload.page,
+        page_size=payload.page_size,
+        nights=nights.total,
+        weekday_nights=nights.weekday,
+        weekend_nights=nights.weekend,
+    )
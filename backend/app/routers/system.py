@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+
+from app import models
+from app.auth.deps import get_current_admin
+from app.auth.user_cache import user_cache
+from app.core.rate_limit import admission
+from app.database import engine, pool_metrics
+from app.services.search_cache import search_cache
+
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+
+@router.get("/cache")
+async def get_cache_stats(_admin: models.User = Depends(get_current_admin)):
+    return {"users": user_cache.stats(), "search": search_cache.stats()}
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats(_admin: models.User = Depends(get_current_admin)):
+    return pool_metrics.snapshot(engine.sync_engine.pool)
+
+
+@router.get("/admission")
+async def get_admission_stats(_admin: models.User = Depends(get_current_admin)):
+    return admission.stats()
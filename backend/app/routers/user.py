@@ -1,18 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
 from sqlalchemy import select
-from app.database import get_db
+from app.database import get_db, invalidation_bus
 from app.schemas import user
 from app import models, schemas
-from app.auth.hash import hash_password
+from app.auth.hash import hash_password, verify_password
 from app.auth.deps import get_current_admin, get_current_user, get_current_user_optional
-from app.auth.jwt_handler import create_access_token
+from app.auth.jwt_handler import create_user_access_token
+from app.auth.refresh_tokens import (
+    issue_refresh_token,
+    revoke_refresh_token,
+    revoke_user_refresh_tokens,
+    rotate_refresh_token,
+)
+from app.core.config import settings
+from app.auth.user_cache import user_cache
+from app.services.pagination import MAX_PAGE_SIZE, StreamFormat, list_with_keyset
 
 router = APIRouter(prefix='/auth', tags=['Auth'])
 
-pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
@@ -36,7 +43,7 @@ async def create_user(
 
     db_user = models.User(
         email=user.email,
-        hashed_password = hash_password(user.password),
+        hashed_password = await hash_password(user.password),
         first_name = user.first_name,
         last_name = user.last_name,
         role = user_role,
@@ -49,11 +56,23 @@ async def create_user(
 
 @router.get("/", response_model=list[schemas.user.UserOut])
 async def get_users(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    stream: StreamFormat | None = None,
     db: AsyncSession = Depends(get_db),
     _admin: models.User = Depends(get_current_admin),
 ):
-    result = await db.execute(select(models.user.User))
-    return result.scalars().all()
+    return await list_with_keyset(
+        db,
+        select(models.user.User),
+        models.user.User,
+        schemas.user.UserOut,
+        response,
+        limit=limit,
+        cursor=cursor,
+        stream=stream,
+    )
 
 
 @router.get("/users/{user_id}", response_model=schemas.user.UserOut)
@@ -75,20 +94,45 @@ async def get_user(
     return user_ext
 
 
-@router.post("/login")
+def _token_pair(user_obj: models.User, refresh_token: str) -> schemas.user.TokenPair:
+    return schemas.user.TokenPair(
+        access_token=create_user_access_token(user_obj),
+        refresh_token=refresh_token,
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+@router.post("/login", response_model=schemas.user.TokenPair)
 async def login(user: schemas.user.UserLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(models.User).filter(models.User.email == user.email))
     db_user = result.scalar_one_or_none()
+    # Hand the pooled connection back before the slow password check.
+    await db.close()
 
-    if not db_user or not pwd_context.verify(user.password, db_user.hashed_password):
+    if not db_user or not await verify_password(user.password, db_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверный email или пароль",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = create_access_token({"sub": db_user.email})
-    return {"access_token": token, "token_type": "bearer"}
+    refresh_token = await issue_refresh_token(db, db_user.id)
+    await db.commit()
+    return _token_pair(db_user, refresh_token)
+
+
+@router.post("/refresh", response_model=schemas.user.TokenPair)
+async def refresh(payload: schemas.user.RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    # One indexed lookup and no bcrypt: clients refresh instead of logging in again.
+    db_user, refresh_token = await rotate_refresh_token(db, payload.refresh_token)
+    await db.commit()
+    return _token_pair(db_user, refresh_token)
+
+
+@router.post("/logout", status_code=204)
+async def logout(payload: schemas.user.RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    await revoke_refresh_token(db, payload.refresh_token)
+    await db.commit()
 
 @router.get("/me", response_model=user.UserOut)
 async def read_users_me(current_user: models.User = Depends(get_current_user)):
@@ -114,7 +158,9 @@ async def delete_user(
         raise HTTPException(status_code=404, detail="Пользователь не найден")
 
     await db.delete(user_to_delete)
+    await invalidation_bus.publish(db, "user", id=user_id)
     await db.commit()
+    user_cache.invalidate_user(user_id)
     return {"detail": f"Пользователь {user_id} успешно удалён"}
 
 
@@ -147,12 +193,19 @@ async def update_user(
         )
 
     if "password" in update_data:
-        update_data["hashed_password"] = hash_password(update_data.pop("password"))
+        update_data["hashed_password"] = await hash_password(update_data.pop("password"))
 
     for key, value in update_data.items():
         setattr(db_user, key, value)
 
+    # Stop the sessions being renewed; the user_cache invalidation below makes
+    # admin routes re-check the role claim of access tokens already issued.
+    if "hashed_password" in update_data or "role" in update_data:
+        await revoke_user_refresh_tokens(db, user_id)
+
+    await invalidation_bus.publish(db, "user", id=user_id)
     await db.commit()
+    user_cache.invalidate_user(user_id)
     await db.refresh(db_user)
 
     return db_user
@@ -1,19 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from app.auth.deps import get_current_admin
-from app.database import get_db
+from app.auth.user_cache import user_cache
+from app.database import get_db, invalidation_bus
 from app import models, schemas
+from app.services.pagination import MAX_PAGE_SIZE, StreamFormat, list_with_keyset
 
 router = APIRouter(prefix="/user_admin", tags=["Admin"])
 
 @router.get("/", response_model=list[schemas.user.UserOut])
 async def get_users(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    stream: StreamFormat | None = None,
     db: AsyncSession = Depends(get_db),
     _admin: models.User = Depends(get_current_admin),
 ):
-    result = await db.execute(select(models.User))
-    return result.scalars().all()
+    return await list_with_keyset(
+        db,
+        select(models.User),
+        models.User,
+        schemas.user.UserOut,
+        response,
+        limit=limit,
+        cursor=cursor,
+        stream=stream,
+    )
 
 @router.delete("/{user_id}")
 async def delete_user(
@@ -23,7 +37,10 @@ async def delete_user(
 ):
     query = delete(models.User).where(models.User.id == user_id)
     result = await db.execute(query)
+    if result.rowcount:
+        await invalidation_bus.publish(db, "user", id=user_id)
     await db.commit()
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    user_cache.invalidate_user(user_id)
     return {"message": "User deleted"}
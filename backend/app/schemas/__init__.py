@@ -3,3 +3,6 @@ from .user import *
 from .room import *
 from .cabin import *
 from .media import *
+from .availability import *
+from .search import *
+from .pricing import *
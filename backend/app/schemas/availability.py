@@ -0,0 +1,24 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+
+class NightRange(BaseModel):
+    start: date
+    end: date
+
+
+class AvailabilityCalendarOut(BaseModel):
+    object_type: str
+    object_id: int
+    date_from: date = Field(alias="from")
+    date_to: date = Field(alias="to")
+    booked_ranges: list[NightRange]
+    booked_nights: list[date]
+    free_nights: list[date]
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True,
+    )
@@ -45,5 +45,11 @@ class SearchRequest(BaseModel):
 class CabinOut(CabinBase):
     id: int
     created_at: datetime
+    # WebP srcset per entry of images (None until variants exist); catalog only.
+    image_srcsets: List[Optional[str]] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CabinSearchOut(CabinOut):
+    total_price: int
@@ -31,6 +31,7 @@ class BookingOut(BookingBase):
     room_id: int | None = None
     cabin_id: int | None = None
     status: Literal["pending", "confirmed", "cancelled"]
+    total_price: int | None = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -42,3 +43,19 @@ class MyBookingOut(BookingOut):
 
 class BookingStatusUpdate(BaseModel):
     status: Literal["pending", "confirmed", "cancelled"]
+
+
+class BookingImportRow(BookingCreate):
+    status: Literal["pending", "confirmed", "cancelled"] = "pending"
+
+
+class BookingImportError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class BookingImportReport(BaseModel):
+    received: int
+    imported: int
+    dry_run: bool
+    errors: list[BookingImportError]
@@ -31,9 +31,85 @@ class PresignUploadResponse(BaseModel):
     )
 
 
+class PresignUploadBatchRequest(BaseModel):
+    files: list[PresignUploadRequest] = Field(min_length=1, max_length=100)
+
+
+class PresignUploadBatchResponse(BaseModel):
+    items: list[PresignUploadResponse]
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True,
+    )
+
+
 class DeleteMediaRequest(BaseModel):
     key: str = Field(min_length=1)
 
 
 class DeleteMediaResponse(BaseModel):
     success: bool
+
+
+class DeleteMediaBatchRequest(BaseModel):
+    keys: list[str] = Field(min_length=1, max_length=1000)
+
+    @field_validator("keys")
+    @classmethod
+    def reject_empty_keys(cls, value: list[str]) -> list[str]:
+        if any(not key for key in value):
+            raise ValueError("Keys must not be empty")
+        return value
+
+
+class DeleteMediaError(BaseModel):
+    key: str
+    code: str
+    message: str
+
+
+class DeleteMediaBatchResponse(BaseModel):
+    success: bool
+    deleted: list[str]
+    errors: list[DeleteMediaError]
+
+
+class CompleteUploadRequest(BaseModel):
+    keys: list[str] = Field(min_length=1, max_length=50)
+
+
+class MediaVariantOut(BaseModel):
+    url: str
+    width: int
+    height: int
+    byte_size: int
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True,
+    )
+
+
+class CompleteUploadItem(BaseModel):
+    key: str
+    srcset: str
+    variants: list[MediaVariantOut]
+
+
+class CompleteUploadResponse(BaseModel):
+    items: list[CompleteUploadItem]
+
+
+class MediaGcReport(BaseModel):
+    dry_run: bool
+    grace_hours: float
+    scanned: int
+    referenced: int
+    orphaned: int
+    orphaned_bytes: int
+    skipped_recent: int
+    deleted: int
+    # At most ORPHAN_SAMPLE_SIZE keys; the counts above are exact.
+    orphan_keys: list[str]
+    errors: list[DeleteMediaError]
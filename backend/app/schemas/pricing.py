@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+
+class QuoteItemIn(BaseModel):
+    object_type: Literal["room", "cabin"]
+    object_id: int
+    start_date: datetime
+    end_date: datetime
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class QuoteRequest(BaseModel):
+    items: list[QuoteItemIn] = Field(..., min_length=1, max_length=500)
+
+
+class QuoteOut(QuoteItemIn):
+    nights: int
+    weekday_nights: int
+    weekend_nights: int
+    price_weekdays: int
+    price_weekend: int
+    weekday_total: int
+    weekend_total: int
+    total_price: int
@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict, Field
-from typing import List
+from typing import List, Optional
 from pydantic.alias_generators import to_camel
 
 class RoomBase(BaseModel):
@@ -47,6 +47,8 @@ class QuickSearchRequest(BaseModel):
 class RoomOut(RoomBase):
     id: int
     created_at: datetime
+    # WebP srcset per entry of images (None until variants exist); catalog only.
+    image_srcsets: List[Optional[str]] = []
 
     model_config = ConfigDict(
         from_attributes=True,  # 👈 важно, чтобы FastAPI мапил ORM в схему
@@ -55,3 +57,5 @@ class RoomOut(RoomBase):
     )
 
 
+class RoomSearchOut(RoomOut):
+    total_price: int
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+from .cabin import CabinOut
+from .room import GuestInfoRoom, RoomOut
+
+
+class UnifiedSearchRequest(BaseModel):
+    start_date: datetime
+    end_date: datetime
+    guests: list[GuestInfoRoom] = Field(..., min_length=1)
+
+    object_type: Literal["room", "cabin"] | None = None
+    category: str | None = None
+    pool: bool | None = None
+    tv: bool | None = None
+    min_price: int | None = Field(None, ge=0)
+    max_price: int | None = Field(None, ge=0)
+
+    sort: Literal["price_asc", "price_desc"] = "price_asc"
+    page: int = Field(1, ge=1)
+    page_size: int = Field(20, ge=1, le=100)
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class SearchHit(BaseModel):
+    object_type: Literal["room", "cabin"]
+    object_id: int
+    total_price: int
+    item: RoomOut | CabinOut
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class SearchPage(BaseModel):
+    items: list[SearchHit]
+    total: int
+    page: int
+    page_size: int
+    nights: int
+    weekday_nights: int
+    weekend_nights: int
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
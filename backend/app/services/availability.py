@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.dates import as_utc
+from app.database import AsyncSessionLocal, InvalidationBus
+
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_BOOKING_STATUSES = ("pending", "confirmed")
+
+ObjectKey = tuple[str, int]
+Mutation = tuple[Callable[..., None], tuple[Any, ...]]
+
+
+class AvailabilityIndex:
+    """Process-local view of active bookings per room/cabin.
+
+    Each object keeps its active bookings as a list of ``(start, end, booking_id)``
+    tuples sorted by start. Active bookings of one object never overlap (the
+    database enforces it with exclusion constraints), so an overlap check for
+    ``[start, end)`` is a single bisect: only the last booking starting before
+    ``end`` can reach into the requested range.
+
+    A full load runs while requests are served. Every mutation made while a
+    load is in flight is also recorded and replayed onto the freshly loaded
+    maps, so changes racing the load's queries are not lost. Mutations are
+    idempotent, so replaying one the load already saw is harmless.
+    """
+
+    RELOAD_RETRY_SECONDS = 1.0
+    MAX_RELOAD_RETRY_SECONDS = 30.0
+
+    def __init__(self) -> None:
+        self.ready = False
+        self._capacity: dict[ObjectKey, int] = {}
+        self._intervals: dict[ObjectKey, list[tuple[datetime, datetime, int]]] = {}
+        self._bookings: dict[int, tuple[ObjectKey, datetime, datetime]] = {}
+        # One mutation log per load in flight.
+        self._loads_in_flight: list[list[Mutation]] = []
+
+    async def load(self, db: AsyncSession) -> None:
+        mutations: list[Mutation] = []
+        self._loads_in_flight.append(mutations)
+        try:
+            await self._load(db, mutations)
+        finally:
+            self._loads_in_flight.remove(mutations)
+
+    async def _load(self, db: AsyncSession, mutations: list[Mutation]) -> None:
+        rooms = await db.execute(
+            select(
+                models.Room.id,
+                func.coalesce(models.Room.capacity, models.Room.beds, 0),
+            )
+        )
+        cabins = await db.execute(select(models.Cabin.id, models.Cabin.beds))
+        bookings = await db.execute(
+            select(
+                models.Booking.id,
+                models.Booking.object_type,
+                models.Booking.object_id,
+                models.Booking.start_date,
+                models.Booking.end_date,
+            )
+            .where(models.Booking.status.in_(ACTIVE_BOOKING_STATUSES))
+            .order_by(models.Booking.start_date)
+        )
+
+        capacity: dict[ObjectKey, int] = {}
+        intervals: dict[ObjectKey, list[tuple[datetime, datetime, int]]] = {}
+        booking_map: dict[int, tuple[ObjectKey, datetime, datetime]] = {}
+
+        for object_id, object_capacity in rooms.all():
+            capacity[("room", object_id)] = object_capacity
+        for object_id, object_capacity in cabins.all():
+            capacity[("cabin", object_id)] = object_capacity
+        for booking_id, object_type, object_id, start, end in bookings.all():
+            key = (object_type, object_id)
+            start, end = as_utc(start), as_utc(end)
+            # Rows arrive ordered by start_date, so appending keeps lists sorted.
+            intervals.setdefault(key, []).append((start, end, booking_id))
+            booking_map[booking_id] = (key, start, end)
+
+        self._capacity = capacity
+        self._intervals = intervals
+        self._bookings = booking_map
+        for mutation, args in mutations:
+            mutation(*args)
+        self.ready = True
+        logger.info(
+            "Availability index loaded: %d objects, %d active bookings, %d replayed changes",
+            len(capacity),
+            len(booking_map),
+            len(mutations),
+        )
+
+    def _mutate(self, mutation: Callable[..., None], *args: Any) -> None:
+        for mutations in self._loads_in_flight:
+            mutations.append((mutation, args))
+        mutation(*args)
+
+    def set_object(self, object_type: str, object_id: int, capacity: int) -> None:
+        self._mutate(self._set_object, object_type, object_id, capacity)
+
+    def drop_object(self, object_type: str, object_id: int) -> None:
+        self._mutate(self._drop_object, object_type, object_id)
+
+    def add_booking(
+        self,
+        booking_id: int,
+        object_type: str,
+        object_id: int,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        self._mutate(self._add_booking, booking_id, object_type, object_id, start, end)
+
+    def remove_booking(self, booking_id: int) -> None:
+        self._mutate(self._remove_booking, booking_id)
+
+    def _set_object(self, object_type: str, object_id: int, capacity: int) -> None:
+        self._capacity[(object_type, object_id)] = capacity
+
+    def _drop_object(self, object_type: str, object_id: int) -> None:
+        key = (object_type, object_id)
+        self._capacity.pop(key, None)
+        for _start, _end, booking_id in self._intervals.pop(key, []):
+            self._bookings.pop(booking_id, None)
+
+    def _add_booking(
+        self,
+        booking_id: int,
+        object_type: str,
+        object_id: int,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        self._remove_booking(booking_id)
+        key = (object_type, object_id)
+        start, end = as_utc(start), as_utc(end)
+        insort(self._intervals.setdefault(key, []), (start, end, booking_id))
+        self._bookings[booking_id] = (key, start, end)
+
+    def _remove_booking(self, booking_id: int) -> None:
+        entry = self._bookings.pop(booking_id, None)
+        if entry is None:
+            return
+        key, start, end = entry
+        intervals = self._intervals.get(key)
+        if not intervals:
+            return
+        position = bisect_left(intervals, (start, end, booking_id))
+        if position < len(intervals) and intervals[position][2] == booking_id:
+            del intervals[position]
+        if not intervals:
+            del self._intervals[key]
+
+    def apply_booking(self, booking: models.Booking) -> None:
+        """Sync one booking row after it was created or its status changed."""
+        if booking.status in ACTIVE_BOOKING_STATUSES:
+            self.add_booking(
+                booking.id,
+                booking.object_type,
+                booking.object_id,
+                booking.start_date,
+                booking.end_date,
+            )
+        else:
+            self.remove_booking(booking.id)
+
+    def handle_booking_event(self, data: dict) -> None:
+        if data.get("deleted"):
+            self.remove_booking(data["id"])
+        elif data["status"] in ACTIVE_BOOKING_STATUSES:
+            self.add_booking(
+                data["id"],
+                data["object_type"],
+                data["object_id"],
+                datetime.fromisoformat(data["start_date"]),
+                datetime.fromisoformat(data["end_date"]),
+            )
+        else:
+            self.remove_booking(data["id"])
+
+    def handle_object_event(self, object_type: str, data: dict) -> None:
+        if data.get("deleted"):
+            self.drop_object(object_type, data["id"])
+        else:
+            self.set_object(object_type, data["id"], data["capacity"])
+
+    async def reload(self) -> None:
+        async with AsyncSessionLocal() as session:
+            await self.load(session)
+
+    async def reload_until_ready(self) -> None:
+        """Reload, retrying with backoff until a load succeeds.
+
+        The index may have missed changes when this is called, so it is marked
+        not ready first: searches use SQL until the load completes. Bus events
+        that arrive meanwhile are still applied, and replayed onto the loaded
+        maps (see :meth:`load`).
+        """
+        self.ready = False
+        delay = self.RELOAD_RETRY_SECONDS
+        while True:
+            try:
+                await self.reload()
+                return
+            except Exception:
+                logger.exception("Failed to load availability index, retrying in %.0fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.MAX_RELOAD_RETRY_SECONDS)
+
+    def is_free(self, object_type: str, object_id: int, start: datetime, end: datetime) -> bool:
+        intervals = self._intervals.get((object_type, object_id))
+        if not intervals:
+            return True
+        start, end = as_utc(start), as_utc(end)
+        position = bisect_left(intervals, (end,))
+        return position == 0 or intervals[position - 1][1] <= start
+
+    def free_objects(
+        self,
+        object_type: str,
+        start: datetime,
+        end: datetime,
+        total_guests: int,
+    ) -> list[int]:
+        start, end = as_utc(start), as_utc(end)
+        return sorted(
+            object_id
+            for (key_type, object_id), capacity in self._capacity.items()
+            if key_type == object_type
+            and capacity >= total_guests
+            and self.is_free(object_type, object_id, start, end)
+        )
+
+
+def booking_event(booking: models.Booking) -> dict:
+    return {
+        "id": booking.id,
+        "object_type": booking.object_type,
+        "object_id": booking.object_id,
+        "status": booking.status,
+        "start_date": as_utc(booking.start_date).isoformat(),
+        "end_date": as_utc(booking.end_date).isoformat(),
+    }
+
+
+def register_invalidation_handlers(bus: InvalidationBus) -> None:
+    bus.subscribe("booking", availability_index.handle_booking_event)
+    bus.subscribe("room", lambda data: availability_index.handle_object_event("room", data))
+    bus.subscribe("cabin", lambda data: availability_index.handle_object_event("cabin", data))
+    # Bulk imports carry no per-row events; peers reload the whole index.
+    bus.subscribe("booking_import", lambda _data: availability_index.reload_until_ready())
+    bus.on_resync(availability_index.reload_until_ready)
+
+
+availability_index = AvailabilityIndex()
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from pydantic import ValidationError
+from sqlalchemy import literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.database import engine
+from app.schemas.checkout import BookingImportError, BookingImportReport, BookingImportRow
+from app.services.availability import ACTIVE_BOOKING_STATUSES
+from app.services.pricing import quote
+
+
+BookingFormat = Literal["csv", "ndjson"]
+
+# Column order shared by CSV export and import.
+EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "user_id",
+    "object_type",
+    "object_id",
+    "room_id",
+    "cabin_id",
+    "last_name",
+    "first_name",
+    "middle_name",
+    "phone",
+    "email",
+    "citizenship",
+    "comments",
+    "payment",
+    "status",
+    "start_date",
+    "end_date",
+    "total_price",
+)
+COPY_COLUMNS = (
+    "object_type",
+    "object_id",
+    "room_id",
+    "cabin_id",
+    "last_name",
+    "first_name",
+    "middle_name",
+    "phone",
+    "email",
+    "citizenship",
+    "comments",
+    "payment",
+    "status",
+    "start_date",
+    "end_date",
+    "total_price",
+)
+TIMESTAMP_COLUMNS = {"created_at", "start_date", "end_date"}
+# Timestamps go out as ISO 8601 (to_json) so an export re-imports as is.
+CSV_EXPORT_QUERY = "SELECT {} FROM bookings ORDER BY id".format(
+    ", ".join(
+        f"to_json({column}) #>> '{{}}' AS {column}" if column in TIMESTAMP_COLUMNS else column
+        for column in EXPORT_COLUMNS
+    )
+)
+# COPY's text format would backslash-escape the JSON, so NDJSON goes through
+# CSV mode with a quote and delimiter that never occur in row_to_json output.
+NDJSON_EXPORT_QUERY = (
+    "SELECT row_to_json(b) FROM (SELECT {} FROM bookings ORDER BY id) AS b".format(
+        ", ".join(EXPORT_COLUMNS)
+    )
+)
+NDJSON_COPY_OPTIONS = {"format": "csv", "quote": "\x01", "delimiter": "\x02"}
+
+# Overlaps of every imported row with active bookings, in one statement.
+DB_OVERLAP_QUERY = text(
+    """
+    SELECT c.row_no
+    FROM unnest(
+        CAST(:row_nos AS integer[]),
+        CAST(:object_types AS text[]),
+        CAST(:object_ids AS integer[]),
+        CAST(:starts AS timestamptz[]),
+        CAST(:ends AS timestamptz[])
+    ) AS c(row_no, object_type, object_id, start_date, end_date)
+    WHERE EXISTS (
+        SELECT 1
+        FROM bookings b
+        WHERE b.object_type = c.object_type
+          AND b.object_id = c.object_id
+          AND b.status IN ('pending', 'confirmed')
+          AND b.start_date < c.end_date
+          AND b.end_date > c.start_date
+    )
+    """
+)
+
+
+def parse_bookings(data: str, fmt: BookingFormat) -> list[dict | None]:
+    """Split a CSV or NDJSON payload into raw row dicts (blank CSV cells are dropped).
+
+    An NDJSON line that is not valid JSON becomes ``None`` and is reported as such.
+    """
+    if fmt == "ndjson":
+        rows: list[dict | None] = []
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(None)
+        return rows
+
+    reader = csv.DictReader(io.StringIO(data))
+    return [
+        {key: value for key, value in row.items() if key and value not in ("", None)}
+        for row in reader
+    ]
+
+
+def _validate_rows(
+    raw_rows: list[dict | None],
+) -> tuple[dict[int, BookingImportRow], dict[int, list[str]]]:
+    valid: dict[int, BookingImportRow] = {}
+    errors: dict[int, list[str]] = {}
+    for row_no, raw in enumerate(raw_rows, start=1):
+        if not isinstance(raw, dict):
+            errors[row_no] = ["invalid JSON" if raw is None else "expected a JSON object"]
+            continue
+        try:
+            row = BookingImportRow.model_validate(raw)
+        except ValidationError as exc:
+            errors[row_no] = [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in exc.errors()
+            ]
+            continue
+        if row.start_date >= row.end_date:
+            errors[row_no] = ["start_date must be before end_date"]
+            continue
+        valid[row_no] = row
+    return valid, errors
+
+
+def _find_batch_overlaps(rows: dict[int, BookingImportRow]) -> dict[int, int]:
+    """Map each active row that overlaps an earlier active row of the batch to that row."""
+    by_object: dict[tuple[str, int], list[tuple[int, BookingImportRow]]] = {}
+    for row_no, row in rows.items():
+        if row.status in ACTIVE_BOOKING_STATUSES:
+            by_object.setdefault((row.object_type, row.object_id), []).append((row_no, row))
+
+    overlaps: dict[int, int] = {}
+    for object_rows in by_object.values():
+        object_rows.sort(key=lambda item: item[1].start_date)
+        last_row_no, last_end = None, None
+        for row_no, row in object_rows:
+            if last_end is not None and row.start_date < last_end:
+                overlaps[row_no] = last_row_no
+                continue
+            last_row_no, last_end = row_no, row.end_date
+    return overlaps
+
+
+async def _object_prices(
+    db: AsyncSession, rows: dict[int, BookingImportRow]
+) -> dict[tuple[str, int], tuple[int, int]]:
+    """Weekday/weekend prices of the referenced objects; missing objects are absent."""
+    wanted = {(row.object_type, row.object_id) for row in rows.values()}
+    room_ids = [object_id for object_type, object_id in wanted if object_type == "room"]
+    cabin_ids = [object_id for object_type, object_id in wanted if object_type == "cabin"]
+    result = await db.execute(
+        select(
+            literal("room"),
+            models.Room.id,
+            models.Room.price_weekdays,
+            models.Room.price_weekend,
+        )
+        .where(models.Room.id.in_(room_ids))
+        .union_all(
+            select(
+                literal("cabin"),
+                models.Cabin.id,
+                models.Cabin.price_weekdays,
+                models.Cabin.price_weekend,
+            ).where(models.Cabin.id.in_(cabin_ids))
+        )
+    )
+    return {
+        (object_type, object_id): (price_weekdays, price_weekend)
+        for object_type, object_id, price_weekdays, price_weekend in result.all()
+    }
+
+
+async def _database_overlaps(db: AsyncSession, rows: dict[int, BookingImportRow]) -> set[int]:
+    active = [(row_no, row) for row_no, row in rows.items() if row.status in ACTIVE_BOOKING_STATUSES]
+    if not active:
+        return set()
+    result = await db.execute(
+        DB_OVERLAP_QUERY,
+        {
+            "row_nos": [row_no for row_no, _row in active],
+            "object_types": [row.object_type for _row_no, row in active],
+            "object_ids": [row.object_id for _row_no, row in active],
+            "starts": [row.start_date for _row_no, row in active],
+            "ends": [row.end_date for _row_no, row in active],
+        },
+    )
+    return set(result.scalars().all())
+
+
+def _copy_record(row: BookingImportRow, prices: dict[tuple[str, int], tuple[int, int]]) -> tuple:
+    price_weekdays, price_weekend = prices[(row.object_type, row.object_id)]
+    return (
+        row.object_type,
+        row.object_id,
+        row.object_id if row.object_type == "room" else None,
+        row.object_id if row.object_type == "cabin" else None,
+        row.last_name,
+        row.first_name,
+        row.middle_name,
+        row.phone,
+        str(row.email),
+        row.citizenship,
+        row.comments,
+        row.payment,
+        row.status,
+        row.start_date,
+        row.end_date,
+        quote(price_weekdays, price_weekend, row.start_date, row.end_date).total,
+    )
+
+
+async def import_bookings(
+    db: AsyncSession,
+    raw_rows: list[dict | None],
+    *,
+    dry_run: bool = False,
+    atomic: bool = False,
+) -> BookingImportReport:
+    """Validate, conflict-check and COPY a batch of bookings.
+
+    Invalid rows are reported and skipped; with ``atomic`` any error aborts the
+    whole batch. The caller commits. Raises
+    ``asyncpg.IntegrityConstraintViolationError`` when a concurrent writer books
+    the same dates between the check and the COPY.
+    """
+    valid, errors = _validate_rows(raw_rows)
+
+    for row_no, earlier_row_no in _find_batch_overlaps(valid).items():
+        errors[row_no] = [f"overlaps row {earlier_row_no} of this batch"]
+        del valid[row_no]
+
+    prices: dict[tuple[str, int], tuple[int, int]] = {}
+    if valid:
+        prices = await _object_prices(db, valid)
+        for row_no, row in list(valid.items()):
+            if (row.object_type, row.object_id) not in prices:
+                errors[row_no] = [f"{row.object_type} {row.object_id} not found"]
+                del valid[row_no]
+
+    if valid:
+        for row_no in await _database_overlaps(db, valid):
+            errors[row_no] = ["overlaps an existing active booking"]
+            del valid[row_no]
+
+    imported = 0
+    if valid and not dry_run and not (atomic and errors):
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "bookings",
+            records=[_copy_record(valid[row_no], prices) for row_no in sorted(valid)],
+            columns=COPY_COLUMNS,
+        )
+        imported = len(valid)
+
+    return BookingImportReport(
+        received=len(raw_rows),
+        imported=imported,
+        dry_run=dry_run,
+        errors=[
+            BookingImportError(row=row_no, errors=messages)
+            for row_no, messages in sorted(errors.items())
+        ],
+    )
+
+
+async def export_bookings(fmt: BookingFormat) -> AsyncIterator[bytes]:
+    """Stream the bookings table as CSV or NDJSON straight from ``COPY ... TO STDOUT``.
+
+    The export runs on its own connection: request-scoped sessions are closed
+    before a streaming body is sent.
+    """
+    if fmt == "ndjson":
+        query, options = NDJSON_EXPORT_QUERY, NDJSON_COPY_OPTIONS
+    else:
+        query, options = CSV_EXPORT_QUERY, {"format": "csv", "header": True}
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=16)
+
+    async def produce() -> None:
+        try:
+            async with engine.connect() as connection:
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.copy_from_query(
+                    query, output=lambda chunk: queue.put(bytes(chunk)), **options
+                )
+        finally:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+        await producer
+    finally:
+        producer.cancel()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select
+
+from app import models, schemas
+from app.core.config import settings
+from app.database import AsyncSessionLocal, InvalidationBus
+from app.services.media_variants import load_srcsets
+
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot(Generic[SchemaT]):
+    version: int
+    body: bytes
+    etag: str
+    items: dict[int, SchemaT]
+
+
+class CatalogCache(Generic[SchemaT]):
+    """Public list of rooms or cabins, serialized once per catalog version.
+
+    Admin writes call :meth:`invalidate` (locally and through the invalidation
+    bus); the next request rebuilds the snapshot with one query. The ETag is a
+    hash of the response bytes, so every worker hands out the same ETag for
+    the same catalog.
+    """
+
+    def __init__(self, model: type, schema: type[SchemaT]) -> None:
+        self.model = model
+        self.schema = schema
+        self.version = 0
+        self._adapter = TypeAdapter(list[schema])
+        self._snapshot: CatalogSnapshot[SchemaT] | None = None
+        self._lock = asyncio.Lock()
+        # Version of the last snapshot rebuilt because an id was missing.
+        self._refreshed_version: int | None = None
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._snapshot = None
+
+    async def get(self) -> CatalogSnapshot[SchemaT]:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        async with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            snapshot = await self._build()
+            # Keep it only if no write invalidated the catalog while loading.
+            if snapshot.version == self.version:
+                self._snapshot = snapshot
+            return snapshot
+
+    async def get_including(self, object_ids: Iterable[int]) -> CatalogSnapshot[SchemaT]:
+        """A snapshot holding every id in ``object_ids`` that still exists.
+
+        An id found by a database query but missing from the snapshot belongs
+        to an object created by another worker whose invalidation has not
+        arrived yet, so the snapshot is rebuilt, at most once per catalog
+        version. Ids still missing after that (objects deleted since the
+        query) are left for the caller to drop.
+        """
+        snapshot = await self.get()
+        if snapshot.version == self._refreshed_version:
+            return snapshot
+        if any(object_id not in snapshot.items for object_id in object_ids):
+            # Another request may already have invalidated it for the same miss.
+            if self.version == snapshot.version:
+                self.invalidate()
+            snapshot = await self.get()
+            self._refreshed_version = snapshot.version
+        return snapshot
+
+    async def _build(self) -> CatalogSnapshot[SchemaT]:
+        version = self.version
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(self.model).order_by(self.model.id))
+            rows = result.scalars().all()
+            srcsets = await load_srcsets(session, [url for row in rows for url in row.images or []])
+        items = [self.schema.model_validate(row) for row in rows]
+        if srcsets:
+            for item in items:
+                item.image_srcsets = [srcsets.get(url) for url in item.images or []]
+        body = self._adapter.dump_json(items, by_alias=True)
+        return CatalogSnapshot(
+            version=version,
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            items={item.id: item for item in items},
+        )
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+
+async def catalog_response(catalog: CatalogCache, request: Request) -> Response:
+    snapshot = await catalog.get()
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": (
+            f"public, max-age={settings.CATALOG_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={settings.CATALOG_STALE_WHILE_REVALIDATE_SECONDS}"
+        ),
+    }
+    if _etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+def invalidate_catalogs() -> None:
+    room_catalog.invalidate()
+    cabin_catalog.invalidate()
+
+
+def register_invalidation_handlers(bus: InvalidationBus) -> None:
+    bus.subscribe("room", lambda _data: room_catalog.invalidate())
+    bus.subscribe("cabin", lambda _data: cabin_catalog.invalidate())
+    bus.subscribe("media", lambda _data: invalidate_catalogs())
+    bus.on_resync(room_catalog.invalidate)
+    bus.on_resync(cabin_catalog.invalidate)
+
+
+room_catalog: CatalogCache[schemas.RoomOut] = CatalogCache(models.Room, schemas.RoomOut)
+cabin_catalog: CatalogCache[schemas.CabinOut] = CatalogCache(models.Cabin, schemas.CabinOut)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.services import r2
+
+
+ORPHAN_SAMPLE_SIZE = 1000
+
+
+def _image_urls(model):
+    return select(func.jsonb_array_elements_text(model.images).label("url")).where(
+        func.jsonb_typeof(model.images) == "array"
+    )
+
+
+# Set-based: Postgres unnests and de-duplicates every gallery in one pass.
+REFERENCED_URLS_QUERY = union(_image_urls(models.Room), _image_urls(models.Cabin))
+
+
+async def _referenced_keys(db: AsyncSession) -> set[str]:
+    referenced: set[str] = set()
+    async for url in await db.stream_scalars(REFERENCED_URLS_QUERY):
+        key = r2.key_from_public_url(url)
+        if key is not None:
+            referenced.add(key)
+
+    # Variants live as long as their original is referenced.
+    variants = await db.stream(
+        select(models.MediaVariant.source_key, models.MediaVariant.file_key)
+    )
+    async for source_key, file_key in variants:
+        if source_key in referenced:
+            referenced.add(file_key)
+    return referenced
+
+
+async def collect_garbage(
+    db: AsyncSession,
+    *,
+    dry_run: bool,
+    grace_hours: float,
+    prefix: str = "",
+) -> schemas.MediaGcReport:
+    """Delete bucket objects that no room or cabin gallery refers to.
+
+    The bucket is listed before the references are read, so an image saved
+    onto a room while the listing runs is still seen as referenced. Objects
+    newer than ``grace_hours`` are kept: they may be uploads whose room form
+    has not been saved yet. The caller commits the manifest cleanup.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=grace_hours)
+    objects: dict[str, tuple[datetime, int]] = {}
+    async for page in r2.list_files(prefix):
+        for item in page:
+            objects[item["Key"]] = (item["LastModified"], item["Size"])
+
+    referenced = await _referenced_keys(db)
+    unreferenced = [key for key in objects if key not in referenced]
+    orphans = [key for key in unreferenced if objects[key][0] < cutoff]
+
+    deleted: list[str] = []
+    errors: list[dict[str, str]] = []
+    if orphans and not dry_run:
+        deleted, errors = await r2.delete_files(orphans)
+        for i in range(0, len(deleted), r2.DELETE_BATCH_SIZE):
+            batch = deleted[i : i + r2.DELETE_BATCH_SIZE]
+            await db.execute(
+                delete(models.MediaVariant).where(
+                    or_(
+                        models.MediaVariant.source_key.in_(batch),
+                        models.MediaVariant.file_key.in_(batch),
+                    )
+                )
+            )
+
+    return schemas.MediaGcReport(
+        dry_run=dry_run,
+        grace_hours=grace_hours,
+        scanned=len(objects),
+        referenced=len(objects) - len(unreferenced),
+        orphaned=len(orphans),
+        orphaned_bytes=sum(objects[key][1] for key in orphans),
+        skipped_recent=len(unreferenced) - len(orphans),
+        deleted=len(deleted),
+        orphan_keys=orphans[:ORPHAN_SAMPLE_SIZE],
+        errors=errors,
+    )
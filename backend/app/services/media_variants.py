@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from io import BytesIO
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+from app.services import r2
+
+
+logger = logging.getLogger(__name__)
+
+VARIANT_CONTENT_TYPE = "image/webp"
+
+# Decoding and resizing a 10 MB photo holds the GIL for hundreds of
+# milliseconds, so it runs in worker processes. Created on first use so that
+# importing the app (and the CLI) does not start processes. Workers come from a
+# forkserver: forking the threaded server directly could copy a held lock
+# (logging, the bcrypt or R2 thread pools) into a child that then deadlocks.
+_variant_executor: ProcessPoolExecutor | None = None
+
+
+@dataclass(frozen=True)
+class RenderedVariant:
+    width: int
+    height: int
+    data: bytes
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _variant_executor
+    if _variant_executor is None:
+        _variant_executor = ProcessPoolExecutor(
+            max_workers=settings.MEDIA_VARIANT_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _variant_executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died (e.g. OOM-killed) so the next call starts a new one."""
+    global _variant_executor
+    if _variant_executor is executor:
+        _variant_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_executor() -> None:
+    global _variant_executor
+    if _variant_executor is not None:
+        _variant_executor.shutdown(cancel_futures=True)
+        _variant_executor = None
+
+
+def variant_key(source_key: str, width: int) -> str:
+    stem, dot, extension = source_key.rpartition(".")
+    return f"{stem if dot else extension}.w{width}.webp"
+
+
+def render_variants(data: bytes, widths: tuple[int, ...], quality: int) -> list[RenderedVariant]:
+    """Downscale to each width narrower than the original and encode as WebP.
+
+    An original narrower than every width still gets one re-encoded variant
+    at its own size. Runs in a worker process.
+    """
+    with Image.open(BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        targets = [width for width in widths if width < image.width] or [image.width]
+        variants: list[RenderedVariant] = []
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            buffer = BytesIO()
+            resized.save(buffer, format="WEBP", quality=quality, method=4)
+            variants.append(RenderedVariant(width=width, height=height, data=buffer.getvalue()))
+        return variants
+
+
+async def _process_upload(source_key: str) -> list[RenderedVariant]:
+    original = await r2.read_file(source_key)
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    try:
+        variants = await loop.run_in_executor(
+            executor,
+            render_variants,
+            original,
+            settings.MEDIA_VARIANT_WIDTHS,
+            settings.MEDIA_VARIANT_QUALITY,
+        )
+    except BrokenProcessPool:
+        logger.error("Image worker process died while processing %s", source_key)
+        _discard_executor(executor)
+        raise
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise ValueError(f"{source_key} is not a decodable image") from exc
+    await asyncio.gather(
+        *(
+            r2.upload_file(variant_key(source_key, variant.width), variant.data, VARIANT_CONTENT_TYPE)
+            for variant in variants
+        )
+    )
+    return variants
+
+
+async def generate_variants(
+    db: AsyncSession, source_keys: list[str]
+) -> dict[str, list[models.MediaVariant]]:
+    """Render, upload and record the variants of freshly uploaded originals.
+
+    Originals are processed concurrently; the manifest rows for a key are
+    replaced, so calling this again for the same upload is safe. The caller
+    commits.
+    """
+    source_keys = list(dict.fromkeys(source_keys))
+    rendered = await asyncio.gather(*(_process_upload(key) for key in source_keys))
+
+    await db.execute(
+        delete(models.MediaVariant).where(models.MediaVariant.source_key.in_(source_keys))
+    )
+    rows = [
+        {
+            "source_key": source_key,
+            "file_key": variant_key(source_key, variant.width),
+            "width": variant.width,
+            "height": variant.height,
+            "byte_size": len(variant.data),
+        }
+        for source_key, variants in zip(source_keys, rendered)
+        for variant in variants
+    ]
+    result = await db.execute(insert(models.MediaVariant).returning(models.MediaVariant), rows)
+    manifest: dict[str, list[models.MediaVariant]] = {key: [] for key in source_keys}
+    for variant in result.scalars():
+        manifest[variant.source_key].append(variant)
+    return manifest
+
+
+def build_srcset(variants: list[models.MediaVariant]) -> str:
+    return ", ".join(
+        f"{r2.public_url(variant.file_key)} {variant.width}w"
+        for variant in sorted(variants, key=lambda variant: variant.width)
+    )
+
+
+async def load_srcsets(db: AsyncSession, image_urls: list[str]) -> dict[str, str]:
+    """``srcset`` strings for the given public image URLs that have variants."""
+    keys = {key: url for url in image_urls if (key := r2.key_from_public_url(url))}
+    if not keys:
+        return {}
+    result = await db.execute(
+        select(models.MediaVariant).where(models.MediaVariant.source_key.in_(list(keys)))
+    )
+    by_key: dict[str, list[models.MediaVariant]] = {}
+    for variant in result.scalars():
+        by_key.setdefault(variant.source_key, []).append(variant)
+    return {keys[key]: build_srcset(variants) for key, variants in by_key.items()}
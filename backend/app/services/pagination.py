@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Literal
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+StreamFormat = Literal["ndjson"]
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query: Select, model, cursor: str | None, limit: int | None) -> Select:
+    """Order newest first by ``(created_at, id)`` and continue after ``cursor``."""
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor is not None:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def stream_ndjson(query: Select, schema: type[BaseModel]) -> StreamingResponse:
+    """Stream ORM rows as NDJSON from a server-side cursor.
+
+    The stream runs on its own session: request-scoped dependencies are torn
+    down before a streaming body is sent.
+    """
+
+    async def body():
+        async with AsyncSessionLocal() as session:
+            result = await session.stream_scalars(
+                query.execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            async for rows in result.partitions():
+                yield "".join(
+                    schema.model_validate(row).model_dump_json(by_alias=True) + "\n"
+                    for row in rows
+                )
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+async def list_with_keyset(
+    db: AsyncSession,
+    query: Select,
+    model,
+    schema: type[BaseModel],
+    response: Response,
+    *,
+    limit: int | None,
+    cursor: str | None,
+    stream: StreamFormat | None,
+):
+    """Shared body of the admin list endpoints.
+
+    Without ``limit``/``cursor``/``stream`` the full list is returned as before.
+    Otherwise one page of ``limit`` rows is returned and the cursor of the next
+    page is sent in the ``X-Next-Cursor`` header, or the rows are streamed.
+    """
+    if stream == "ndjson":
+        return stream_ndjson(apply_keyset(query, model, cursor, limit), schema)
+
+    if limit is None and cursor is None:
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    result = await db.execute(apply_keyset(query, model, cursor, page_size + 1))
+    rows = result.scalars().all()
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows
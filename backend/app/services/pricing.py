@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class NightCount:
+    weekday: int
+    weekend: int
+
+    @property
+    def total(self) -> int:
+        return self.weekday + self.weekend
+
+
+def count_nights(start: datetime, end: datetime) -> NightCount:
+    """Split a stay into weekday and weekend nights without walking the calendar.
+
+    A night belongs to the resort-local date it starts on; it is a weekend
+    night when that date's weekday is in ``WEEKEND_NIGHTS`` (Friday and
+    Saturday by default). Stays shorter than a day count as one night.
+    """
+    tz = ZoneInfo(settings.RESORT_TIMEZONE)
+    first_night = start.astimezone(tz).date()
+    checkout_day = max(end.astimezone(tz).date(), first_night + timedelta(days=1))
+    nights = (checkout_day - first_night).days
+
+    full_weeks, remainder = divmod(nights, 7)
+    first_weekday = first_night.weekday()
+    weekend = sum(
+        full_weeks + ((weekday - first_weekday) % 7 < remainder)
+        for weekday in settings.WEEKEND_NIGHTS
+    )
+    return NightCount(weekday=nights - weekend, weekend=weekend)
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    nights: NightCount
+    price_weekdays: int
+    price_weekend: int
+
+    @property
+    def weekday_total(self) -> int:
+        return self.nights.weekday * self.price_weekdays
+
+    @property
+    def weekend_total(self) -> int:
+        return self.nights.weekend * self.price_weekend
+
+    @property
+    def total(self) -> int:
+        return self.weekday_total + self.weekend_total
+
+
+def quote(price_weekdays: int, price_weekend: int, start: datetime, end: datetime) -> Quote:
+    return Quote(count_nights(start, end), price_weekdays, price_weekend)
+
+
+def stay_price_expression(model, nights: NightCount):
+    """SQL expression for the stay price of a ``Room``/``Cabin`` row."""
+    return model.price_weekdays * nights.weekday + model.price_weekend * nights.weekend
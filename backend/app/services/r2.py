@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import re
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from uuid import uuid4
-from urllib.parse import quote
+from urllib.parse import quote, unquote
 
 import boto3
 from botocore.config import Config
@@ -23,6 +25,16 @@ MAX_IMAGE_SIZE_BYTES = 10 * 1024 * 1024
 CACHE_CONTROL_HEADER = "public, max-age=31536000, immutable"
 SAFE_FOLDER_RE = re.compile(r"[^a-zA-Z0-9/_-]+")
 SAFE_FILENAME_RE = re.compile(r"[^a-zA-Z0-9._-]+")
+# S3 DeleteObjects accepts at most 1000 keys per request.
+DELETE_BATCH_SIZE = 1000
+
+# boto3 is blocking; storage calls run on their own threads, one per pooled
+# connection, so a slow bucket never stalls the event loop or the default
+# executor.
+_r2_executor = ThreadPoolExecutor(
+    max_workers=settings.R2_MAX_POOL_CONNECTIONS,
+    thread_name_prefix="r2",
+)
 
 
 def _sanitize_folder(folder: str | None) -> str:
@@ -56,10 +68,30 @@ def _build_public_url(file_key: str) -> str:
     return f"{base_url}/{quote(file_key, safe='/')}"
 
 
+def _endpoint_url() -> str:
+    if settings.R2_ENDPOINT_URL:
+        return settings.R2_ENDPOINT_URL
+    return f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
+
+
+def public_url(file_key: str) -> str:
+    return _build_public_url(file_key)
+
+
+def key_from_public_url(url: str) -> str | None:
+    """The bucket key behind a public URL, or None for foreign URLs."""
+    if not settings.R2_PUBLIC_BASE_URL:
+        return None
+    prefix = settings.R2_PUBLIC_BASE_URL.rstrip("/") + "/"
+    if not url.startswith(prefix):
+        return None
+    return unquote(url[len(prefix) :]) or None
+
+
 def is_r2_configured() -> bool:
     return all(
         [
-            settings.R2_ACCOUNT_ID,
+            settings.R2_ACCOUNT_ID or settings.R2_ENDPOINT_URL,
             settings.R2_ACCESS_KEY_ID,
             settings.R2_SECRET_ACCESS_KEY,
             settings.R2_BUCKET_NAME,
@@ -73,17 +105,25 @@ def get_r2_client():
     if not is_r2_configured():
         raise RuntimeError("R2 is not fully configured")
 
-    endpoint_url = f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
+    # boto3 clients are thread-safe; the connection pool is sized to the executor.
     return boto3.client(
         "s3",
-        endpoint_url=endpoint_url,
+        endpoint_url=_endpoint_url(),
         region_name=settings.R2_REGION,
         aws_access_key_id=settings.R2_ACCESS_KEY_ID,
         aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-        config=Config(signature_version="s3v4"),
+        config=Config(
+            signature_version="s3v4",
+            max_pool_connections=settings.R2_MAX_POOL_CONNECTIONS,
+        ),
     )
 
 
+async def _run_storage_call(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_r2_executor, partial(func, *args, **kwargs))
+
+
 def create_presigned_upload(
     *,
     filename: str,
@@ -121,8 +161,86 @@ def create_presigned_upload(
     }
 
 
-def delete_file(file_key: str) -> None:
+def _read_object(file_key: str, max_bytes: int) -> bytes:
+    response = get_r2_client().get_object(Bucket=settings.R2_BUCKET_NAME, Key=file_key)
+    body = response["Body"]
+    try:
+        if response.get("ContentLength", 0) > max_bytes:
+            raise ValueError("Image is too large. Max size is 10MB")
+        return body.read()
+    finally:
+        body.close()
+
+
+async def read_file(file_key: str, max_bytes: int = MAX_IMAGE_SIZE_BYTES) -> bytes:
+    if not is_r2_configured():
+        raise RuntimeError("R2 storage is not configured")
+    return await _run_storage_call(_read_object, file_key, max_bytes)
+
+
+async def upload_file(file_key: str, data: bytes, content_type: str) -> None:
+    """Write a derived object under the same immutable caching as uploads."""
+    if not is_r2_configured():
+        raise RuntimeError("R2 storage is not configured")
+    client = get_r2_client()
+    await _run_storage_call(
+        client.put_object,
+        Bucket=settings.R2_BUCKET_NAME,
+        Key=file_key,
+        Body=data,
+        ContentType=content_type,
+        CacheControl=CACHE_CONTROL_HEADER,
+    )
+
+
+async def list_files(prefix: str = ""):
+    """Yield pages of ``ListObjectsV2`` contents (up to 1000 objects each)."""
     if not is_r2_configured():
         raise RuntimeError("R2 storage is not configured")
     client = get_r2_client()
-    client.delete_object(Bucket=settings.R2_BUCKET_NAME, Key=file_key)
+    params = {"Bucket": settings.R2_BUCKET_NAME, "Prefix": prefix, "MaxKeys": 1000}
+    while True:
+        response = await _run_storage_call(client.list_objects_v2, **params)
+        yield response.get("Contents", [])
+        if not response.get("IsTruncated"):
+            return
+        params["ContinuationToken"] = response["NextContinuationToken"]
+
+
+async def delete_file(file_key: str) -> None:
+    if not is_r2_configured():
+        raise RuntimeError("R2 storage is not configured")
+    client = get_r2_client()
+    await _run_storage_call(client.delete_object, Bucket=settings.R2_BUCKET_NAME, Key=file_key)
+
+
+async def delete_files(file_keys: list[str]) -> tuple[list[str], list[dict[str, str]]]:
+    """Delete keys with ``DeleteObjects``, one request per 1000 keys.
+
+    Returns the deleted keys and the per-key errors reported by the bucket.
+    Deleting a missing key counts as deleted, as with ``delete_object``.
+    """
+    if not is_r2_configured():
+        raise RuntimeError("R2 storage is not configured")
+    client = get_r2_client()
+    keys = list(dict.fromkeys(file_keys))
+    responses = await asyncio.gather(
+        *(
+            _run_storage_call(
+                client.delete_objects,
+                Bucket=settings.R2_BUCKET_NAME,
+                Delete={
+                    "Objects": [{"Key": key} for key in keys[i : i + DELETE_BATCH_SIZE]],
+                    "Quiet": True,
+                },
+            )
+            for i in range(0, len(keys), DELETE_BATCH_SIZE)
+        )
+    )
+    errors = [
+        {"key": error["Key"], "code": error.get("Code", ""), "message": error.get("Message", "")}
+        for response in responses
+        for error in response.get("Errors", [])
+    ]
+    failed = {error["key"] for error in errors}
+    return [key for key in keys if key not in failed], errors
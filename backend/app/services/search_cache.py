@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.dates import as_utc
+from app.database import InvalidationBus
+
+
+SearchKey = tuple[str, datetime, datetime, int]
+
+
+class SearchCache:
+    """LRU/TTL cache of free object ids per ``(object_type, start, end, total_guests)``.
+
+    A booking change evicts only the entries of the same object type whose
+    date range overlaps the booking; room/cabin changes drop the whole type.
+    ``generation`` is bumped on every eviction so a search computed while a
+    change was committed is not stored.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int) -> None:
+        self.generation = 0
+        self._entries: TTLCache[SearchKey, tuple[int, ...]] = TTLCache(ttl_seconds, max_size)
+
+    @property
+    def enabled(self) -> bool:
+        return self._entries.enabled
+
+    @staticmethod
+    def key(object_type: str, start: datetime, end: datetime, total_guests: int) -> SearchKey:
+        return (object_type, as_utc(start), as_utc(end), total_guests)
+
+    def get(self, key: SearchKey) -> tuple[int, ...] | None:
+        return self._entries.get(key)
+
+    def put(self, key: SearchKey, object_ids: list[int], generation: int) -> None:
+        if generation == self.generation:
+            self._entries.put(key, tuple(object_ids))
+
+    def invalidate_range(self, object_type: str, start: datetime, end: datetime) -> None:
+        self.generation += 1
+        start, end = as_utc(start), as_utc(end)
+        for key in self._entries.keys():
+            if key[0] == object_type and key[1] < end and key[2] > start:
+                self._entries.pop(key)
+
+    def invalidate_type(self, object_type: str) -> None:
+        self.generation += 1
+        for key in self._entries.keys():
+            if key[0] == object_type:
+                self._entries.pop(key)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def handle_booking_event(self, data: dict) -> None:
+        if "start_date" not in data:
+            self.clear()
+            return
+        self.invalidate_range(
+            data["object_type"],
+            datetime.fromisoformat(data["start_date"]),
+            datetime.fromisoformat(data["end_date"]),
+        )
+
+    def stats(self) -> dict[str, float]:
+        return self._entries.stats()
+
+
+def register_invalidation_handlers(bus: InvalidationBus) -> None:
+    bus.subscribe("booking", search_cache.handle_booking_event)
+    bus.subscribe("booking_import", lambda _data: search_cache.clear())
+    bus.subscribe("room", lambda _data: search_cache.invalidate_type("room"))
+    bus.subscribe("cabin", lambda _data: search_cache.invalidate_type("cabin"))
+    bus.on_resync(search_cache.clear)
+
+
+search_cache = SearchCache(
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+    max_size=settings.SEARCH_CACHE_MAX_SIZE,
+)
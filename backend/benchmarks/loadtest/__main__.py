@@ -0,0 +1,302 @@
+"""Load test: seeded data, weighted scenario mix, per-endpoint latency report.
+
+    # wipe and seed a throwaway database (asks for its name unless --yes)
+    python -m benchmarks.loadtest seed --database-url postgresql+asyncpg://localhost/loadtest \
+        --rooms 200 --cabins 50 --users 2000 --bookings 100000
+
+    # drive the app in-process, or a running server with --base-url
+    python -m benchmarks.loadtest run --vus 50 --duration 60 --json before.json
+    python -m benchmarks.loadtest run --base-url http://localhost:8000 --json after.json
+
+    # compare two reports endpoint by endpoint
+    python -m benchmarks.loadtest compare before.json after.json
+
+``run`` expects data from ``seed`` with the same ``--rooms/--cabins/--users``
+and ``--anchor-date``; the in-process app uses DATABASE_URL.
+All virtual users share one client IP, so the in-process app runs without
+rate limiting; start a target server with ``RATE_LIMIT_ENABLED=false`` too.
+Requires ``httpx`` (see benchmarks/requirements.txt).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from datetime import date, datetime, timezone
+
+import httpx
+from sqlalchemy.engine import make_url
+
+# Must be set before app settings are first imported (via the seed module).
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from benchmarks.common import summarize_ms  # noqa: E402
+from benchmarks.loadtest.scenarios import (  # noqa: E402
+    DEFAULT_MIX,
+    SCENARIOS,
+    EndpointStats,
+    Session,
+    parse_mix,
+)
+from benchmarks.loadtest.seed import (  # noqa: E402
+    ADMIN_EMAIL,
+    USER_PASSWORD,
+    SeedConfig,
+    anchor_datetime,
+    seed,
+    user_email,
+)
+
+
+TOKEN_POOL_SIZE = 20
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _confirm_wipe(database_url: str, assume_yes: bool) -> bool:
+    database = make_url(database_url).database
+    if assume_yes:
+        return True
+    if not sys.stdin.isatty():
+        print("Refusing to wipe a database non-interactively without --yes", file=sys.stderr)
+        return False
+    answer = input(f"This drops every table in {database!r}. Type its name to continue: ")
+    return answer.strip() == database
+
+
+async def _token(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/auth/login", json={"email": email, "password": USER_PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _virtual_user(
+    session: Session,
+    mix: dict[str, float],
+    deadline: float,
+    think_time: float,
+) -> None:
+    names = list(mix)
+    weights = list(mix.values())
+    while time.perf_counter() < deadline:
+        scenario = SCENARIOS[session.rng.choices(names, weights)[0]]
+        await scenario(session)
+        if think_time:
+            await asyncio.sleep(session.rng.uniform(0, 2 * think_time))
+
+
+async def run_load(args: argparse.Namespace) -> dict:
+    mix = parse_mix(args.mix)
+    stats: dict[str, EndpointStats] = {}
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        else:
+            from app.main import app
+
+            # ASGITransport does not send lifespan events; run startup here.
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://loadtest",
+                timeout=args.timeout,
+            )
+        await stack.enter_async_context(client)
+        admin_token = await _token(client, ADMIN_EMAIL)
+        user_tokens = [
+            await _token(client, user_email(i))
+            for i in range(1, min(TOKEN_POOL_SIZE, args.users) + 1)
+        ]
+        sessions = [
+            Session(
+                client=client,
+                rng=random.Random(args.seed * 1000 + vu),
+                stats=stats,
+                user_tokens=user_tokens,
+                admin_token=admin_token,
+                users=args.users,
+                rooms=args.rooms,
+                cabins=args.cabins,
+                anchor=anchor_datetime(args.anchor_date),
+            )
+            for vu in range(args.vus)
+        ]
+
+        if args.warmup:
+            warmup_stats: dict[str, EndpointStats] = {}
+            for session in sessions:
+                session.stats = warmup_stats
+            deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(
+                *(_virtual_user(session, mix, deadline, args.think_time) for session in sessions)
+            )
+            for session in sessions:
+                session.stats = stats
+
+        began = time.perf_counter()
+        deadline = began + args.duration
+        await asyncio.gather(
+            *(_virtual_user(session, mix, deadline, args.think_time) for session in sessions)
+        )
+        elapsed = time.perf_counter() - began
+
+    endpoints = {
+        label: {
+            **summarize_ms(endpoint.latencies),
+            "throughput_rps": len(endpoint.latencies) / elapsed,
+            "statuses": {str(code): count for code, count in sorted(endpoint.statuses.items())},
+            "errors": endpoint.errors,
+        }
+        for label, endpoint in sorted(stats.items())
+    }
+    all_latencies = [sample for endpoint in stats.values() for sample in endpoint.latencies]
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "target": args.base_url or "in-process",
+            "vus": args.vus,
+            "duration_s": args.duration,
+            "mix": mix,
+            "seed": args.seed,
+            "anchor_date": args.anchor_date.isoformat(),
+        },
+        "total": {
+            **summarize_ms(all_latencies),
+            "throughput_rps": len(all_latencies) / elapsed,
+            "errors": sum(endpoint.errors for endpoint in stats.values()),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"{'endpoint':<34}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses")
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for label, stats in rows:
+        print(
+            f"{label:<34}{stats['throughput_rps']:>9.1f}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}  {stats.get('statuses', '')}"
+        )
+
+
+def compare(before_path: str, after_path: str) -> None:
+    with open(before_path, encoding="utf-8") as fh:
+        before = json.load(fh)
+    with open(after_path, encoding="utf-8") as fh:
+        after = json.load(fh)
+
+    def delta(old: float, new: float) -> str:
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    print(
+        f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}\n"
+        f"{'endpoint':<34}{'p50':>10}{'p95':>10}{'p99':>10}{'rps':>10}"
+    )
+    labels = sorted(set(before["endpoints"]) & set(after["endpoints"])) + ["TOTAL"]
+    for label in labels:
+        old = before["total"] if label == "TOTAL" else before["endpoints"][label]
+        new = after["total"] if label == "TOTAL" else after["endpoints"][label]
+        print(
+            f"{label:<34}"
+            + "".join(
+                f"{delta(old[key], new[key]):>10}"
+                for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+            )
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest", description=__doc__.splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_data_shape(command: argparse.ArgumentParser) -> None:
+        defaults = SeedConfig()
+        command.add_argument("--rooms", type=int, default=defaults.rooms)
+        command.add_argument("--cabins", type=int, default=defaults.cabins)
+        command.add_argument("--users", type=int, default=defaults.users)
+        command.add_argument("--seed", type=int, default=defaults.seed)
+        command.add_argument(
+            "--anchor-date",
+            type=date.fromisoformat,
+            default=defaults.anchor_date,
+            help="the data set's 'today' (YYYY-MM-DD); keep it fixed across commits",
+        )
+
+    seed_parser = commands.add_parser("seed", help="wipe a database and load seed data")
+    add_data_shape(seed_parser)
+    seed_parser.add_argument("--bookings", type=int, default=SeedConfig().bookings)
+    seed_parser.add_argument(
+        "--database-url", required=True, help="database to wipe; DATABASE_URL is not used"
+    )
+    seed_parser.add_argument("--yes", action="store_true", help="do not ask for confirmation")
+
+    run_parser = commands.add_parser("run", help="run the scenario mix")
+    add_data_shape(run_parser)
+    run_parser.add_argument("--base-url", help="target a running server, not the in-process app")
+    run_parser.add_argument("--vus", type=int, default=20, help="concurrent virtual users")
+    run_parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    run_parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds first")
+    run_parser.add_argument("--think-time", type=float, default=0.0, help="mean pause in seconds")
+    run_parser.add_argument("--timeout", type=float, default=30.0)
+    run_parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight,...")
+    run_parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+
+    compare_parser = commands.add_parser("compare", help="diff two JSON reports")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+
+    args = parser.parse_args()
+
+    if args.command == "seed":
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        if not _confirm_wipe(args.database_url, args.yes):
+            sys.exit(1)
+        engine = create_async_engine(args.database_url)
+        config = SeedConfig(
+            rooms=args.rooms,
+            cabins=args.cabins,
+            users=args.users,
+            bookings=args.bookings,
+            seed=args.seed,
+            anchor_date=args.anchor_date,
+        )
+
+        async def run_seed() -> None:
+            try:
+                await seed(engine, config)
+            finally:
+                await engine.dispose()
+
+        asyncio.run(run_seed())
+    elif args.command == "run":
+        report = asyncio.run(run_load(args))
+        print_report(report)
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+    else:
+        compare(args.before, args.after)
+
+
+if __name__ == "__main__":
+    main()
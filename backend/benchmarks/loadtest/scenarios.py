@@ -0,0 +1,170 @@
+"""Weighted user scenarios for the load test.
+
+A scenario is a coroutine taking a :class:`Session`; every request it makes
+is recorded under a stable label (``METHOD route-template``), so reports from
+different commits line up endpoint by endpoint.
+"""
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import httpx
+
+from benchmarks.loadtest.seed import FUTURE_DAYS, USER_PASSWORD, user_email
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+
+
+@dataclass
+class Session:
+    """Per virtual user state: its HTTP client, RNG and shared recorder."""
+
+    client: httpx.AsyncClient
+    rng: random.Random
+    stats: dict[str, EndpointStats]
+    user_tokens: list[str]
+    admin_token: str
+    users: int
+    rooms: int
+    cabins: int
+    # The seeded data set's "today"; stays are drawn after it.
+    anchor: datetime
+
+    async def request(self, label: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        endpoint = self.stats.setdefault(label, EndpointStats())
+        began = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            endpoint.errors += 1
+            return None
+        endpoint.latencies.append(time.perf_counter() - began)
+        endpoint.statuses[response.status_code] = endpoint.statuses.get(response.status_code, 0) + 1
+        return response
+
+    def auth(self, token: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+    def stay(self, max_nights: int = 7) -> tuple[datetime, datetime]:
+        start = self.anchor + timedelta(days=self.rng.randint(1, FUTURE_DAYS), hours=14)
+        return start, start + timedelta(days=self.rng.randint(1, max_nights), hours=-2)
+
+
+async def browse_catalog(session: Session) -> None:
+    await session.request("GET /room_admin/public", "GET", "/room_admin/public")
+    await session.request("GET /cabin_admin/public", "GET", "/cabin_admin/public")
+
+
+async def search(session: Session) -> None:
+    start, end = session.stay()
+    guests = [{"adults": session.rng.randint(1, 4), "children": session.rng.randint(0, 2)}]
+    await session.request(
+        "POST /search",
+        "POST",
+        "/search",
+        json={
+            "startDate": start.isoformat(),
+            "endDate": end.isoformat(),
+            "guests": guests,
+            "sort": session.rng.choice(["price_asc", "price_desc"]),
+        },
+    )
+    await session.request(
+        "POST /room_admin/public/search",
+        "POST",
+        "/room_admin/public/search",
+        json={"startDate": start.isoformat(), "endDate": end.isoformat(), "guests": guests},
+    )
+    await session.request(
+        "POST /cabin_admin/public/search",
+        "POST",
+        "/cabin_admin/public/search",
+        json={"startDate": start.isoformat(), "endDate": end.isoformat(), "guests": guests},
+    )
+
+
+async def login(session: Session) -> None:
+    await session.request(
+        "POST /auth/login",
+        "POST",
+        "/auth/login",
+        json={
+            "email": user_email(session.rng.randint(1, session.users)),
+            "password": USER_PASSWORD,
+        },
+    )
+
+
+async def book(session: Session) -> None:
+    token = session.rng.choice(session.user_tokens)
+    object_type = session.rng.choice(["room", "cabin"])
+    object_id = session.rng.randint(1, session.rooms if object_type == "room" else session.cabins)
+    start, end = session.stay(max_nights=4)
+    # 409 for taken dates is an expected outcome, not an error.
+    await session.request(
+        "POST /checkout/",
+        "POST",
+        "/checkout/",
+        headers=session.auth(token),
+        json={
+            "object_type": object_type,
+            "object_id": object_id,
+            "last_name": "Load",
+            "first_name": "Test",
+            "phone": "+70000000000",
+            "email": "loadtest@example.com",
+            "citizenship": "KZ",
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+        },
+    )
+    await session.request("GET /checkout/my", "GET", "/checkout/my", headers=session.auth(token))
+
+
+async def admin_list(session: Session) -> None:
+    headers = session.auth(session.admin_token)
+    response = await session.request(
+        "GET /checkout/", "GET", "/checkout/", params={"limit": 100}, headers=headers
+    )
+    cursor = response.headers.get("X-Next-Cursor") if response is not None else None
+    if cursor:
+        await session.request(
+            "GET /checkout/ (page 2)",
+            "GET",
+            "/checkout/",
+            params={"limit": 100, "cursor": cursor},
+            headers=headers,
+        )
+    await session.request("GET /auth/", "GET", "/auth/", params={"limit": 100}, headers=headers)
+
+
+Scenario = Callable[[Session], Awaitable[None]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "browse": browse_catalog,
+    "search": search,
+    "login": login,
+    "book": book,
+    "admin": admin_list,
+}
+DEFAULT_MIX = "browse=40,search=35,login=5,book=10,admin=10"
+
+
+def parse_mix(raw: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
@@ -0,0 +1,171 @@
+"""Deterministic seed data for the load test.
+
+Everything derives from one ``random.Random(seed)`` and a fixed anchor date
+(the "today" of the data set; scenarios pick their stays relative to it), so
+two runs with the same arguments load identical catalogs, users and bookings
+whatever day they run on.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app import models
+from app.auth.hash import hash_password
+from app.database import Base
+
+
+USER_PASSWORD = "loadtest-password"
+ADMIN_EMAIL = "loadtest-admin@example.com"
+HISTORY_DAYS = 730
+FUTURE_DAYS = 180
+DEFAULT_ANCHOR_DATE = date(2025, 1, 1)
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    rooms: int = 200
+    cabins: int = 50
+    users: int = 2000
+    bookings: int = 100_000
+    seed: int = 42
+    anchor_date: date = DEFAULT_ANCHOR_DATE
+
+
+def anchor_datetime(anchor_date: date) -> datetime:
+    return datetime.combine(anchor_date, datetime.min.time(), tzinfo=timezone.utc)
+
+
+def user_email(index: int) -> str:
+    return f"loadtest{index}@example.com"
+
+
+async def seed(engine: AsyncEngine, config: SeedConfig) -> None:
+    """Drop and recreate all tables, then load the configured data set.
+
+    Destructive: the caller is responsible for pointing ``engine`` at a
+    throwaway database.
+    """
+    rng = random.Random(config.seed)
+    # One bcrypt hash shared by every seeded account keeps seeding fast.
+    hashed_password = await hash_password(USER_PASSWORD)
+    today = anchor_datetime(config.anchor_date)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+        await conn.execute(
+            insert(models.User),
+            [
+                {
+                    "email": ADMIN_EMAIL,
+                    "hashed_password": hashed_password,
+                    "first_name": "Load",
+                    "last_name": "Admin",
+                    "role": models.UserRole.admin,
+                    "created_at": today,
+                }
+            ]
+            + [
+                {
+                    "email": user_email(i),
+                    "hashed_password": hashed_password,
+                    "first_name": f"User{i}",
+                    "last_name": "Load",
+                    "role": models.UserRole.client,
+                    "created_at": today,
+                }
+                for i in range(1, config.users + 1)
+            ],
+        )
+        await conn.execute(
+            insert(models.Room),
+            [
+                {
+                    "title": f"Room {i}",
+                    "category": rng.choice(["Standard", "Comfort", "Lux"]),
+                    "rooms": rng.randint(1, 3),
+                    "area": f"{rng.randint(18, 60)} m2",
+                    "beds": rng.randint(1, 4),
+                    "tv": rng.random() < 0.7,
+                    "capacity": rng.randint(1, 6),
+                    "price_weekdays": rng.randrange(15000, 60000, 1000),
+                    "price_weekend": rng.randrange(20000, 80000, 1000),
+                    "images": [],
+                    "created_at": today,
+                }
+                for i in range(1, config.rooms + 1)
+            ],
+        )
+        await conn.execute(
+            insert(models.Cabin),
+            [
+                {
+                    "title": f"Cabin {i}",
+                    "rooms": rng.randint(1, 4),
+                    "floors": rng.randint(1, 2),
+                    "beds": rng.randint(2, 10),
+                    "category": rng.choice(["Standard", "Family", "VIP"]),
+                    "price_weekdays": rng.randrange(40000, 150000, 5000),
+                    "price_weekend": rng.randrange(50000, 200000, 5000),
+                    "pool": rng.random() < 0.3,
+                    "images": [],
+                    "created_at": today,
+                }
+                for i in range(1, config.cabins + 1)
+            ],
+        )
+
+        targets = [("room", i) for i in range(1, config.rooms + 1)] + [
+            ("cabin", i) for i in range(1, config.cabins + 1)
+        ]
+        per_object = max(1, config.bookings // len(targets))
+        batch: list[dict] = []
+        for object_type, object_id in targets:
+            # Sequential stays per object so the exclusion constraints hold;
+            # the future gets sparser so booking scenarios still find gaps.
+            cursor = today - timedelta(days=HISTORY_DAYS - rng.randint(0, 3))
+            for _ in range(per_object):
+                start = cursor
+                end = start + timedelta(days=rng.randint(1, 5))
+                gap = rng.randint(0, 4) if end < today else rng.randint(3, 14)
+                cursor = end + timedelta(days=gap)
+                if start > today + timedelta(days=FUTURE_DAYS):
+                    break
+                user_index = rng.randint(1, config.users)
+                batch.append(
+                    {
+                        "user_id": user_index + 1,
+                        "object_type": object_type,
+                        "object_id": object_id,
+                        "room_id": object_id if object_type == "room" else None,
+                        "cabin_id": object_id if object_type == "cabin" else None,
+                        "last_name": "Load",
+                        "first_name": f"User{user_index}",
+                        "phone": "+70000000000",
+                        "email": user_email(user_index),
+                        "citizenship": "KZ",
+                        "payment": "card",
+                        "status": rng.choices(
+                            ["pending", "confirmed", "cancelled"], weights=[1, 7, 2]
+                        )[0],
+                        "start_date": start,
+                        "end_date": end,
+                        "created_at": min(start, today) - timedelta(days=7),
+                    }
+                )
+                if len(batch) >= 5000:
+                    await conn.execute(insert(models.Booking), batch)
+                    batch = []
+        if batch:
+            await conn.execute(insert(models.Booking), batch)
+
+    # VACUUM cannot run inside a transaction; it also enables index-only scans.
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql("VACUUM ANALYZE")
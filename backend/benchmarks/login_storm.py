@@ -0,0 +1,131 @@
+"""Login-storm benchmark: latency of unrelated endpoints while bcrypt logins run.
+
+Drives the ASGI app in-process. A probe requests a cheap endpoint at a fixed
+interval, first on an idle app and then while ``--concurrency`` clients hammer
+``POST /auth/login``. If password hashing blocked the event loop, the probe p99
+would grow by roughly one bcrypt verification per queued login.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.login_storm --duration 10
+
+Requires ``httpx`` (see benchmarks/requirements.txt) and a migrated database;
+a benchmark user is created if it does not exist. Rate limiting is turned off:
+the storm comes from one client IP and would be answered with 429s.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+from sqlalchemy import select
+
+# Must be set before app settings are first imported.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from app import models  # noqa: E402
+from app.auth.hash import hash_password  # noqa: E402
+from app.database import AsyncSessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.common import summarize_ms  # noqa: E402
+
+
+BENCH_EMAIL = "login-storm@example.com"
+BENCH_PASSWORD = "login-storm-password"
+
+
+async def ensure_user() -> None:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(models.User.id).where(models.User.email == BENCH_EMAIL)
+        )
+        if result.scalar_one_or_none() is not None:
+            return
+        session.add(
+            models.User(
+                email=BENCH_EMAIL,
+                hashed_password=await hash_password(BENCH_PASSWORD),
+                first_name="Login",
+                last_name="Storm",
+            )
+        )
+        await session.commit()
+
+
+async def probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, interval: float) -> list[float]:
+    samples: list[float] = []
+    while not stop.is_set():
+        began = time.perf_counter()
+        response = await client.get(path)
+        samples.append(time.perf_counter() - began)
+        response.raise_for_status()
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def login_worker(client: httpx.AsyncClient, stop: asyncio.Event, statuses: dict[int, int], latencies: list[float]) -> None:
+    body = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+    while not stop.is_set():
+        began = time.perf_counter()
+        response = await client.post("/auth/login", json=body)
+        latencies.append(time.perf_counter() - began)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def phase(client: httpx.AsyncClient, args: argparse.Namespace, concurrency: int) -> dict:
+    stop = asyncio.Event()
+    statuses: dict[int, int] = {}
+    login_latencies: list[float] = []
+    probe_task = asyncio.create_task(probe(client, args.probe_path, stop, args.probe_interval))
+    workers = [
+        asyncio.create_task(login_worker(client, stop, statuses, login_latencies))
+        for _ in range(concurrency)
+    ]
+    await asyncio.sleep(args.duration)
+    stop.set()
+    probe_samples = await probe_task
+    await asyncio.gather(*workers)
+    return {
+        "probe": summarize_ms(probe_samples),
+        "login": summarize_ms(login_latencies),
+        "login_statuses": statuses,
+        "login_throughput_rps": len(login_latencies) / args.duration,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    await ensure_user()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(args.probe_path)
+        return {
+            "idle": await phase(client, args, 0),
+            "storm": await phase(client, args, args.concurrency),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per phase")
+    parser.add_argument("--probe-path", default="/openapi.json")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    for name, result in report.items():
+        probe_stats = result["probe"]
+        print(
+            f"{name:<6} probe p50={probe_stats['p50_ms']:.2f}ms p99={probe_stats['p99_ms']:.2f}ms "
+            f"logins={result['login_throughput_rps']:.1f}/s statuses={result['login_statuses']}"
+        )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
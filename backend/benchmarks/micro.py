@@ -0,0 +1,232 @@
+"""Micro-benchmarks for the per-request CPU work: serialization, SQL compilation, JWT.
+
+No database is needed: schemas validate transient ORM instances, which read
+attributes through the same instrumentation as loaded rows.
+
+    python -m benchmarks.micro                     # every case
+    python -m benchmarks.micro -k booking --repeat 15 --json micro.json
+
+Each case is auto-ranged by ``timeit`` to run for ~0.2 s per repeat; the
+report gives the per-call median, the spread across repeats and the best run.
+Compare the median between library upgrades; the stdev tells whether a
+difference is noise.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import timeit
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pydantic
+import sqlalchemy
+from pydantic import TypeAdapter
+from sqlalchemy.dialects import postgresql
+
+from app import models, schemas
+from app.auth.hash import verify_access_token
+from app.auth.jwt_handler import create_access_token
+from app.routers.room_admin import _build_room_search_query
+
+
+NOW = datetime(2025, 6, 1, 12, tzinfo=timezone.utc)
+ROWS = 100
+
+
+def make_rooms(count: int) -> list[models.Room]:
+    return [
+        models.Room(
+            id=i,
+            title=f"Room {i}",
+            category="Comfort",
+            rooms=2,
+            area="32 m2",
+            beds=2,
+            tv=True,
+            capacity=3,
+            price_weekdays=25000,
+            price_weekend=32000,
+            images=[f"https://cdn.example.com/rooms/{i}/{n}.jpg" for n in range(4)],
+            created_at=NOW,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_cabins(count: int) -> list[models.Cabin]:
+    return [
+        models.Cabin(
+            id=i,
+            title=f"Cabin {i}",
+            description="Check-in from 14:00",
+            rooms=3,
+            floors=2,
+            beds=6,
+            category="Family",
+            price_weekdays=90000,
+            price_weekend=120000,
+            pool=i % 3 == 0,
+            images=[f"https://cdn.example.com/cabins/{i}/{n}.jpg" for n in range(6)],
+            created_at=NOW,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_bookings(count: int) -> list[models.Booking]:
+    bookings = []
+    for i in range(1, count + 1):
+        object_type = "room" if i % 2 else "cabin"
+        start = NOW + timedelta(days=i)
+        bookings.append(
+            models.Booking(
+                id=i,
+                object_type=object_type,
+                object_id=i,
+                room_id=i if object_type == "room" else None,
+                cabin_id=i if object_type == "cabin" else None,
+                user_id=7,
+                last_name="Ivanov",
+                first_name="Ivan",
+                middle_name=None,
+                phone="+77000000000",
+                email="guest@example.com",
+                citizenship="KZ",
+                comments=None,
+                payment="card",
+                status="confirmed",
+                total_price=64000,
+                start_date=start,
+                end_date=start + timedelta(days=2),
+                created_at=NOW,
+            )
+        )
+    return bookings
+
+
+def build_cases() -> dict[str, Callable[[], object]]:
+    rooms = make_rooms(ROWS)
+    cabins = make_cabins(ROWS)
+    bookings = make_bookings(ROWS)
+    room_list = TypeAdapter(list[schemas.RoomOut])
+    cabin_list = TypeAdapter(list[schemas.CabinOut])
+    titles = {booking.object_id: f"Object {booking.object_id}" for booking in bookings}
+    columns = [column.key for column in models.Booking.__table__.columns]
+    my_rows = [
+        SimpleNamespace(
+            **{column: getattr(booking, column) for column in columns},
+            object_title=titles[booking.object_id],
+        )
+        for booking in bookings
+    ]
+    dialect = postgresql.asyncpg.dialect()
+    token = create_access_token({"sub": "guest@example.com", "uid": 7, "role": "client"})
+
+    def room_out_validate():
+        return [schemas.RoomOut.model_validate(room) for room in rooms]
+
+    def room_out_dump_json():
+        return room_list.dump_json(room_out_validate(), by_alias=True)
+
+    def cabin_out_validate():
+        return [schemas.CabinOut.model_validate(cabin) for cabin in cabins]
+
+    def cabin_out_dump_json():
+        return cabin_list.dump_json(cabin_out_validate(), by_alias=True)
+
+    def booking_out_validate():
+        return [schemas.BookingOut.model_validate(booking) for booking in bookings]
+
+    def my_bookings_validate_copy():
+        # The former per-row work in checkout.get_my_bookings, kept as a baseline.
+        response = []
+        for booking in bookings:
+            item = schemas.checkout.MyBookingOut.model_validate(booking)
+            response.append(item.model_copy(update={"object_title": titles.get(booking.object_id)}))
+        return response
+
+    def my_bookings_rows():
+        # checkout.get_my_bookings: one validation per joined result row.
+        return [schemas.checkout.MyBookingOut.model_validate(row) for row in my_rows]
+
+    def room_search_build():
+        return _build_room_search_query(NOW, NOW + timedelta(days=3), 2)
+
+    def room_search_cache_key():
+        # What every execution pays before a compiled-cache hit.
+        return room_search_build()._generate_cache_key()
+
+    def room_search_compile():
+        # A compiled-cache miss: full compilation for the asyncpg dialect.
+        return room_search_build().compile(dialect=dialect)
+
+    def jwt_decode():
+        return verify_access_token(token)
+
+    return {
+        f"room_out_validate[{ROWS}]": room_out_validate,
+        f"room_out_dump_json[{ROWS}]": room_out_dump_json,
+        f"cabin_out_validate[{ROWS}]": cabin_out_validate,
+        f"cabin_out_dump_json[{ROWS}]": cabin_out_dump_json,
+        f"booking_out_validate[{ROWS}]": booking_out_validate,
+        f"my_bookings_validate_copy[{ROWS}]": my_bookings_validate_copy,
+        f"my_bookings_rows[{ROWS}]": my_bookings_rows,
+        "room_search_build": room_search_build,
+        "room_search_cache_key": room_search_cache_key,
+        "room_search_compile": room_search_compile,
+        "jwt_decode": jwt_decode,
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict[str, float]:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    # autorange stops at >= 0.2 s; that run doubles as the warm-up.
+    per_call_us = [total / number * 1e6 for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "loops": number,
+        "repeat": repeat,
+        "median_us": statistics.median(per_call_us),
+        "stdev_us": statistics.stdev(per_call_us) if repeat > 1 else 0.0,
+        "min_us": min(per_call_us),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="only cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7, help="timed runs per case")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    cases = {
+        name: func
+        for name, func in build_cases().items()
+        if not args.pattern or args.pattern in name
+    }
+    versions = {
+        "python": platform.python_version(),
+        "pydantic": pydantic.VERSION,
+        "sqlalchemy": sqlalchemy.__version__,
+    }
+    print(", ".join(f"{name} {version}" for name, version in versions.items()))
+    print(f"{'case':<32}{'median us':>12}{'stdev us':>11}{'min us':>11}{'loops':>9}")
+    report = {}
+    for name, func in cases.items():
+        stats = measure(func, args.repeat)
+        report[name] = stats
+        print(
+            f"{name:<32}{stats['median_us']:>12.2f}{stats['stdev_us']:>11.2f}"
+            f"{stats['min_us']:>11.2f}{stats['loops']:>9}"
+        )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump({"versions": versions, "cases": report}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
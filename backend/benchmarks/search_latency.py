@@ -0,0 +1,217 @@
+"""Search latency benchmark: object_id-correlated NOT EXISTS vs room_id/cabin_id anti-join.
+
+Seeds a scratch database with rooms, cabins and bookings, then runs the legacy
+search query and the current ``_build_room_search_query`` /
+``_build_cabin_search_query`` over random date windows and reports p50/p99.
+
+    python -m benchmarks.search_latency --database-url postgresql+asyncpg://... \\
+        --bookings 100000 --iterations 300
+
+The target database is wiped: all application tables are dropped and recreated.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app import models
+from app.database import Base
+from app.routers.cabin_admin import _build_cabin_search_query
+from app.routers.room_admin import _build_room_search_query
+from benchmarks.common import summarize_ms
+
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HORIZON_DAYS = 730
+ACTIVE = ("pending", "confirmed")
+
+
+def legacy_room_query(start_date, end_date, total_guests: int):
+    overlap_exists = (
+        select(models.Booking.id)
+        .where(
+            and_(
+                models.Booking.object_type == "room",
+                models.Booking.object_id == models.Room.id,
+                models.Booking.status.in_(ACTIVE),
+                models.Booking.start_date < end_date,
+                models.Booking.end_date > start_date,
+            )
+        )
+        .exists()
+    )
+    return select(models.Room).where(
+        func.coalesce(models.Room.capacity, models.Room.beds, 0) >= total_guests,
+        ~overlap_exists,
+    )
+
+
+def legacy_cabin_query(start_date, end_date, total_guests: int):
+    overlap_exists = (
+        select(models.Booking.id)
+        .where(
+            and_(
+                models.Booking.object_type == "cabin",
+                models.Booking.object_id == models.Cabin.id,
+                models.Booking.status.in_(ACTIVE),
+                models.Booking.start_date < end_date,
+                models.Booking.end_date > start_date,
+            )
+        )
+        .exists()
+    )
+    return select(models.Cabin).where(models.Cabin.beds >= total_guests, ~overlap_exists)
+
+
+async def seed(engine: AsyncEngine, rooms: int, cabins: int, bookings: int, rng: random.Random) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+        await conn.execute(
+            insert(models.Room),
+            [
+                {
+                    "title": f"Room {i}",
+                    "category": rng.choice(["Standard", "Comfort", "Lux"]),
+                    "rooms": rng.randint(1, 3),
+                    "area": f"{rng.randint(18, 60)} m2",
+                    "beds": rng.randint(1, 4),
+                    "tv": rng.random() < 0.7,
+                    "capacity": rng.randint(1, 6),
+                    "price_weekdays": rng.randrange(15000, 60000, 1000),
+                    "price_weekend": rng.randrange(20000, 80000, 1000),
+                    "images": [],
+                }
+                for i in range(1, rooms + 1)
+            ],
+        )
+        await conn.execute(
+            insert(models.Cabin),
+            [
+                {
+                    "title": f"Cabin {i}",
+                    "rooms": rng.randint(1, 4),
+                    "floors": rng.randint(1, 2),
+                    "beds": rng.randint(2, 10),
+                    "category": rng.choice(["Standard", "Family", "VIP"]),
+                    "price_weekdays": rng.randrange(40000, 150000, 5000),
+                    "price_weekend": rng.randrange(50000, 200000, 5000),
+                    "pool": rng.random() < 0.3,
+                    "images": [],
+                }
+                for i in range(1, cabins + 1)
+            ],
+        )
+
+        targets = [("room", i) for i in range(1, rooms + 1)] + [
+            ("cabin", i) for i in range(1, cabins + 1)
+        ]
+        per_object = max(1, bookings // len(targets))
+        batch: list[dict] = []
+        for object_type, object_id in targets:
+            # Sequential, non-overlapping stays so the exclusion constraints hold.
+            cursor = EPOCH + timedelta(days=rng.randint(0, 3))
+            for _ in range(per_object):
+                nights = rng.randint(1, 5)
+                start = cursor
+                end = start + timedelta(days=nights)
+                cursor = end + timedelta(days=rng.randint(0, 4))
+                batch.append(
+                    {
+                        "object_type": object_type,
+                        "object_id": object_id,
+                        "room_id": object_id if object_type == "room" else None,
+                        "cabin_id": object_id if object_type == "cabin" else None,
+                        "last_name": "Bench",
+                        "first_name": "User",
+                        "phone": "+70000000000",
+                        "email": f"bench{object_id}@example.com",
+                        "citizenship": "KZ",
+                        "payment": "card",
+                        "status": rng.choices(
+                            ["pending", "confirmed", "cancelled"], weights=[2, 6, 2]
+                        )[0],
+                        "start_date": start,
+                        "end_date": end,
+                    }
+                )
+                if len(batch) >= 5000:
+                    await conn.execute(insert(models.Booking), batch)
+                    batch = []
+        if batch:
+            await conn.execute(insert(models.Booking), batch)
+
+    # VACUUM cannot run inside a transaction; it also enables index-only scans.
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql("VACUUM ANALYZE")
+
+
+async def measure(engine: AsyncEngine, build_query, iterations: int, rng: random.Random) -> list[float]:
+    samples: list[float] = []
+    async with engine.connect() as conn:
+        for _ in range(iterations):
+            start = EPOCH + timedelta(days=rng.randint(0, HORIZON_DAYS))
+            end = start + timedelta(days=rng.randint(1, 7))
+            query = build_query(start, end, rng.randint(1, 4))
+            began = time.perf_counter()
+            result = await conn.execute(query)
+            result.all()
+            samples.append(time.perf_counter() - began)
+    return samples
+
+
+async def run(args: argparse.Namespace) -> dict:
+    engine = create_async_engine(args.database_url)
+    try:
+        if not args.skip_seed:
+            await seed(engine, args.rooms, args.cabins, args.bookings, random.Random(args.seed))
+
+        scenarios = {
+            "room_legacy": legacy_room_query,
+            "room_anti_join": _build_room_search_query,
+            "cabin_legacy": legacy_cabin_query,
+            "cabin_anti_join": _build_cabin_search_query,
+        }
+        report = {}
+        for name, build_query in scenarios.items():
+            # Same windows for every scenario, after a short warm-up.
+            await measure(engine, build_query, min(20, args.iterations), random.Random(0))
+            samples = await measure(engine, build_query, args.iterations, random.Random(args.seed))
+            report[name] = summarize_ms(samples)
+        return report
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True, help="scratch database, it is wiped")
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--cabins", type=int, default=50)
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse previously seeded data")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(f"{'scenario':<18}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for name, stats in report.items():
+        print(f"{name:<18}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['mean_ms']:>10.2f}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
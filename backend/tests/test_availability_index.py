@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.services.availability import AvailabilityIndex
+
+
+START = datetime(2026, 7, 1, 14, tzinfo=timezone.utc)
+END = datetime(2026, 7, 3, 12, tzinfo=timezone.utc)
+
+
+class PausedSession:
+    """Answers the index's three load queries; the last one waits for ``release``."""
+
+    def __init__(self, bookings: list[tuple]) -> None:
+        self._results = [[(1, 2)], [], bookings]
+        self.paused = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def execute(self, _statement):
+        rows = self._results.pop(0)
+        if not self._results:
+            self.paused.set()
+            await self.release.wait()
+        return SimpleNamespace(all=lambda: rows)
+
+
+def booking(booking_id: int, status: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=booking_id,
+        object_type="room",
+        object_id=1,
+        start_date=START,
+        end_date=END,
+        status=status,
+    )
+
+
+def test_booking_applied_during_load_survives_the_swap():
+    async def scenario():
+        index = AvailabilityIndex()
+        session = PausedSession(bookings=[])
+        load = asyncio.create_task(index.load(session))
+        await session.paused.wait()
+        # Committed after the bookings query ran, so the loaded rows miss it.
+        index.apply_booking(booking(7, "confirmed"))
+        session.release.set()
+        await load
+        return index
+
+    index = asyncio.run(scenario())
+    assert index.ready
+    assert not index.is_free("room", 1, START, END)
+    assert index.free_objects("room", START, END, 1) == []
+
+
+def test_cancellation_during_load_is_not_undone_by_the_swap():
+    async def scenario():
+        index = AvailabilityIndex()
+        # The bookings query saw booking 7 as active before it was cancelled.
+        session = PausedSession(bookings=[(7, "room", 1, START, END)])
+        load = asyncio.create_task(index.load(session))
+        await session.paused.wait()
+        index.apply_booking(booking(7, "cancelled"))
+        session.release.set()
+        await load
+        return index
+
+    index = asyncio.run(scenario())
+    assert index.is_free("room", 1, START, END)
+    assert index.free_objects("room", START, END, 1) == [1]
+
+
+def test_bus_event_during_resync_reload_is_kept(monkeypatch):
+    session = None
+
+    class SessionFactory:
+        async def __aenter__(self):
+            return session
+
+        async def __aexit__(self, *_exc):
+            return False
+
+    monkeypatch.setattr("app.services.availability.AsyncSessionLocal", SessionFactory)
+
+    async def scenario():
+        nonlocal session
+        index = AvailabilityIndex()
+        session = PausedSession(bookings=[])
+        resync = asyncio.create_task(index.reload_until_ready())
+        await session.paused.wait()
+        assert not index.ready
+        index.handle_booking_event(
+            {
+                "id": 7,
+                "object_type": "room",
+                "object_id": 1,
+                "status": "pending",
+                "start_date": START.isoformat(),
+                "end_date": END.isoformat(),
+            }
+        )
+        session.release.set()
+        await resync
+        return index
+
+    index = asyncio.run(scenario())
+    assert index.ready
+    assert not index.is_free("room", 1, START, END)
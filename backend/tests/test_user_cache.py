@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+
+from app.auth.user_cache import UserCache, UserPrincipal
+from app.models.user import UserRole
+
+
+def principal(role: UserRole) -> UserPrincipal:
+    return UserPrincipal(
+        id=1,
+        email="admin@example.com",
+        first_name="A",
+        last_name="B",
+        role=role,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_read_racing_an_invalidation_is_not_cached():
+    cache = UserCache(ttl_seconds=60, max_size=10, claim_trust_seconds=60)
+    generation = cache.generation
+    # The row was read as admin, then the demotion committed and invalidated.
+    cache.invalidate_user(1)
+    cache.put("admin@example.com", principal(UserRole.admin), generation)
+    assert cache.get("admin@example.com") is None
+
+    cache.put("admin@example.com", principal(UserRole.client), cache.generation)
+    assert cache.get("admin@example.com").role == UserRole.client